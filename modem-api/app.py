@@ -1,4 +1,6 @@
 # app.py  —— 主应用装配
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends
 import config
 
@@ -9,11 +11,22 @@ from routes.ctrl import router as ctrl_router
 from routes.base import router as base_router
 from routes.gnss import router as gnss_router
 from routes import nvr as nvr_router
-from routes.net import router as net_router
+from routes.net import router as net_router, start_route_monitor, stop_route_monitor
 from routes.hls import router as hls_router
 from routes.deps import require_token  # ← 第四步新增的依赖
 
-app = FastAPI(title=config.API_TITLE)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ip monitor 子进程随应用启停，避免重启/--reload 后遗留孤儿进程
+    start_route_monitor()
+    try:
+        yield
+    finally:
+        stop_route_monitor()
+
+
+app = FastAPI(title=config.API_TITLE, lifespan=lifespan)
 
 # 只有当 .env 里 AUTH_REQUIRED=1 才启用鉴权
 _guard = [Depends(require_token)] if config.AUTH_REQUIRED else []
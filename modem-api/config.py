@@ -70,6 +70,20 @@ else:
 NVR_PUBLIC_HOST = os.getenv("NVR_PUBLIC_HOST", NVR_HOST)
 NVR_PUBLIC_SUB_BASE_PORT = _get_int("NVR_PUBLIC_SUB_BASE_PORT", 9550)
 
+# 录像文件交给前置 nginx 直接转发（X-Accel-Redirect），Python 不再逐字节搬运
+# 需要 nginx 配好内部 location，例如：
+#   location /internal-nvr/ { internal; proxy_pass http://<NVR>/v1/recordings/;
+#                             proxy_http_version 1.1; proxy_buffering off; }
+NVR_USE_XACCEL = _get_bool("NVR_USE_XACCEL", False)
+NVR_XACCEL_PREFIX = os.getenv("NVR_XACCEL_PREFIX", "/internal-nvr").rstrip("/")
+
+# /nvr/cameras、/nvr/recordings 列表的短 TTL 缓存（秒），0 表示关闭
+# 过期后带 If-None-Match 回源，NVR 返回 304 时直接续期
+NVR_CACHE_TTL = _get_float("NVR_CACHE_TTL", 3.0)
+
+# 生产环境去掉响应/请求模型字段的 description（只有 /docs 用得到），默认保留
+STRIP_SCHEMA_DOCS = _get_bool("STRIP_SCHEMA_DOCS", False)
+
 
 # NVR URL 生成工具函数
 def get_nvr_base_url() -> str:
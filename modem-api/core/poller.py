@@ -1,5 +1,6 @@
 # core/poller.py
 import threading, time, re
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from core.serial_port import serial_at
 from core.state import state
@@ -28,11 +29,17 @@ def _parse_cops(lines: List[str]) -> Optional[str]:
         if m: return m.group(1)
     return None
 
+# 按传感器名模板出来的正则：每个名字只编译一次
+@lru_cache(maxsize=32)
+def _qtemp_name_pat(name: str) -> "re.Pattern[str]":
+    return re.compile(r'"%s"\s*,\s*"(-?\d+)"' % re.escape(name))
+
 def _parse_qtemp(lines: List[str]) -> Dict[str, Optional[int]]:
     def pick(name: str) -> Optional[int]:
+        pat = _qtemp_name_pat(name)
         for ln in lines:
             if name in ln:
-                m = re.search(r'"%s"\s*,\s*"(-?\d+)"' % re.escape(name), ln)
+                m = pat.search(ln)
                 if m: return int(m.group(1))
         return None
     return {
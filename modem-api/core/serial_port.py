@@ -2,9 +2,10 @@
 import glob
 import logging
 import os
+import re
 import threading
 import time
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import serial
 
@@ -20,6 +21,9 @@ _DEFAULT_DEADLINE = 1.20       # 单条 AT 最大等待时间（秒），通常
 _OK_TOKENS = (b"\r\nOK\r\n", b"\nOK\r\n", b"\r\nOK\n")
 _ERR_TOKENS = (b"\r\nERROR", b"\nERROR", b"+CME ERROR", b"+CMS ERROR")
 
+# 一行 = 非换行字符 + 行尾（\r\n / \r / \n），最后一行可以没有行尾
+_LINE_RE = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")
+
 logger = logging.getLogger(__name__)
 
 def _done(buf: bytes) -> bool:
@@ -30,6 +34,20 @@ def _done(buf: bytes) -> bool:
     return False
 
 
+def _iter_lines(text: str) -> Iterator[str]:
+    """逐行产出原始回显（保留中间空行，丢弃末尾空行），不构造中间列表"""
+    pending = 0  # 暂存的空行数：后面还有内容才补发
+    for m in _LINE_RE.finditer(text):
+        ln = m.group().rstrip("\r\n")
+        if not ln:
+            pending += 1
+            continue
+        for _ in range(pending):
+            yield ""
+        pending = 0
+        yield ln
+
+
 class SerialATError(Exception):
     """Raised when AT 指令执行过程中发生串口或超时异常。"""
 
@@ -178,8 +196,8 @@ class SerialAT:
         self._ser = None
         logger.info(f"Serial port reset: {self._port_label()}")
 
-    def _read_until_done(self, deadline: float) -> List[str]:
-        """从串口读取直到看到 OK/ERROR 或超时"""
+    def _read_until_done(self, deadline: float) -> str:
+        """从串口读取直到看到 OK/ERROR 或超时，返回解码后的整段回显"""
         if self._ser is None:
             raise OSError("Serial port not open")
         t0 = time.time()
@@ -201,15 +219,10 @@ class SerialAT:
             raise TimeoutError("no response from modem")
         if not done:
             raise TimeoutError("AT response incomplete or timed out")
-        # 转行（保留所有原始行）
-        text = buf.decode(errors="ignore")
-        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
-        # 去掉末尾可能的空行
-        while lines and lines[-1] == "":
-            lines.pop()
-        return lines
+        # 分行交给 _iter_lines，按需逐行产出
+        return buf.decode(errors="ignore")
 
-    def _execute_at(self, cmd: str, deadline: float) -> List[str]:
+    def _execute_at(self, cmd: str, deadline: float) -> str:
         """内部方法：执行单次 AT 命令（不包含重连逻辑）"""
         if self._ser is None:
             self._open()
@@ -223,16 +236,27 @@ class SerialAT:
         self._ser.write(data)
         self._ser.flush()
         # 读取
-        lines = self._read_until_done(deadline)
-        if not lines:
+        text = self._read_until_done(deadline)
+        if not text.strip("\r\n"):
             raise SerialATError(f"{cmd} returned empty response")
-        return lines
+        return text
 
     def send(self, cmd: str, deadline: float = _DEFAULT_DEADLINE) -> List[str]:
         """发送一条 AT 并在看到 OK/ERROR 就立刻返回原始回显行
         
         如果遇到 I/O 错误，会自动重连一次再重试。
         """
+        return list(_iter_lines(self._exchange(cmd, deadline)))
+
+    def iter_send(self, cmd: str, deadline: float = _DEFAULT_DEADLINE) -> Iterator[str]:
+        """同 send，但返回逐行迭代器，适合只扫一遍的解析器
+
+        串口交互在调用时就完成（锁不会跨迭代持有），错误也在此刻抛出。
+        """
+        return _iter_lines(self._exchange(cmd, deadline))
+
+    def _exchange(self, cmd: str, deadline: float) -> str:
+        """加锁执行一条 AT（含 I/O 错误重连重试），返回整段回显文本"""
         with self._mu:
             try:
                 return self._execute_at(cmd, deadline)
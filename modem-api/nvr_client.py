@@ -1,30 +1,82 @@
 import logging
-from typing import Any, Dict
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 import config
 
 logger = logging.getLogger(__name__)
 
+# 连接池大小：录像回放会同时占用多条长连接
+_POOL_MAXSIZE = 32
+
+
+@lru_cache(maxsize=1)
+def shared_session() -> requests.Session:
+    """进程内共用的 Session：带连接池，HTTP/1.1 keep-alive 复用到 NVR 的 TCP 连接"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 class NvrClient:
-    def __init__(self) -> None:
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
         self.base_url = config.NVR_BASE_URL
         self.timeout = config.NVR_TIMEOUT
+        self.session = session or shared_session()
+        # path -> {"data": ..., "ts": monotonic, "etag": ...}
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
 
     def _get(self, path: str) -> Dict[str, Any]:
         url = f"{self.base_url}{path}"
         logger.info("NVR GET %s", url)
-        resp = requests.get(url, timeout=self.timeout)
+        resp = self.session.get(url, timeout=self.timeout)
         resp.raise_for_status()
         return resp.json()
 
+    def _get_cached(self, path: str) -> Dict[str, Any]:
+        """
+        列表类接口的短 TTL 缓存：TTL 内直接复用上次结果；
+        过期后若上次带了 ETag，则发条件请求，304 时只续期不重新解析
+        """
+        ttl = config.NVR_CACHE_TTL
+        if ttl <= 0:
+            return self._get(path)
+        with self._cache_lock:
+            entry = self._cache.get(path)
+        now = time.monotonic()
+        if entry is not None and now - entry["ts"] < ttl:
+            return entry["data"]
+
+        url = f"{self.base_url}{path}"
+        logger.info("NVR GET %s", url)
+        headers = None
+        if entry is not None and entry["etag"]:
+            headers = {"If-None-Match": entry["etag"]}
+        resp = self.session.get(url, timeout=self.timeout, headers=headers)
+        if resp.status_code == 304 and entry is not None:
+            data = entry["data"]
+            etag = resp.headers.get("ETag") or entry["etag"]
+        else:
+            resp.raise_for_status()
+            data = resp.json()
+            etag = resp.headers.get("ETag")
+        with self._cache_lock:
+            self._cache[path] = {"data": data, "ts": time.monotonic(), "etag": etag}
+        return data
+
     def health(self) -> Dict[str, Any]:
         return self._get("/v1/health")
 
     def list_cameras(self) -> Dict[str, Any]:
-        return self._get("/v1/cameras")
+        return self._get_cached("/v1/cameras")
 
     def stream(self, ip: str) -> Dict[str, Any]:
         """
@@ -45,7 +97,7 @@ class NvrClient:
 
     def recordings(self) -> Dict[str, Any]:
         """代理 NVR: GET /v1/recordings"""
-        return self._get("/v1/recordings")
+        return self._get_cached("/v1/recordings")
 
     def recordings_days(self, ip: str) -> Dict[str, Any]:
         """代理 NVR: GET /v1/recordings/{ip}/days"""
@@ -87,7 +139,7 @@ class NvrClient:
             if "if-range" in headers or "If-Range" in headers:
                 request_headers["If-Range"] = headers.get("If-Range") or headers.get("if-range")
         
-        resp = requests.get(
+        resp = self.session.get(
             url, 
             timeout=file_timeout, 
             stream=True,
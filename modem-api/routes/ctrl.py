@@ -1,7 +1,8 @@
 # routes/ctrl.py
 import logging
 import re
-import time
+import sys
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
 from fastapi import APIRouter
@@ -11,7 +12,6 @@ from core.serial_port import serial_at, SerialATError
 from .schemas import (
     CtrlBaseResponse,
     CtrlBaseRequest,
-    CtrlActionDetail,
     CtrlRebootRequest,
     CtrlUsbNetRequest,
     CtrlApnRequest,
@@ -29,6 +29,8 @@ from .schemas import (
     NetworkModeState,
     BandPreferenceResponse,
     BandPreferenceState,
+    RawLog,
+    _ms_now,
 )
 
 router = APIRouter(prefix="/ctrl", tags=["ctrl"])
@@ -343,10 +345,17 @@ def _plan_band_preference(req: CtrlBandPreferenceRequest) -> List[str]:
     return cmds
 
 
+# 按参数名模板出来的正则：每个 param_name 只编译一次
+@lru_cache(maxsize=32)
+def _band_pref_pat(param_name: str) -> "re.Pattern[str]":
+    return re.compile(rf'\+QNWPREFCFG:\s*"{param_name}"\s*,\s*([^\r\n]+)')
+
+
 def _parse_band_pref(lines: List[str], param_name: str) -> Optional[List[int]]:
     """解析 AT+QNWPREFCFG="<param_name>" 的返回，提取频段列表"""
+    pat = _band_pref_pat(param_name)
     for line in lines:
-        match = re.search(rf'\+QNWPREFCFG:\s*"{param_name}"\s*,\s*([^\r\n]+)', line)
+        match = pat.search(line)
         if match:
             band_str = match.group(1).strip()
             if not band_str:
@@ -431,7 +440,7 @@ def _execute_plan(
       - 检查 CTRL_ENABLE / CTRL_ALLOW_DANGEROUS
       - 尊重 req.dry_run
       - 收集 AT 回显放到 resp.raw 里面
-      - 统一返回 CtrlActionDetail 结构
+      - 统一返回 CtrlActionDetail 结构（以 CtrlActionDetailTD 形态的 dict 构造）
       - 捕获所有异常，确保不会抛出 500
     
     执行逻辑（按优先级）：
@@ -447,7 +456,7 @@ def _execute_plan(
         executed: bool = False
         blocked_reason: Optional[str] = None
         errors: List[str] = []
-        all_raw: Optional[dict[str, List[str]]] = None
+        all_raw: Optional[RawLog] = None
         
         # 0) 总开关关掉：全 dry_run
         if not CTRL_ENABLE:
@@ -479,28 +488,28 @@ def _execute_plan(
                     logger.info("[%s] sending %s", action, cmd)
                     lines = serial_at.send(cmd)
                     logger.info("[%s] response lines for %s: %s", action, cmd, lines)
-                    all_raw[cmd] = lines
+                    all_raw[sys.intern(cmd)] = tuple(lines)
                 except Exception as e:
                     error_msg = str(e)
                     errors.append(f"{cmd}: {error_msg}")
-                    all_raw[cmd] = [f"ERROR: {error_msg}"]
+                    all_raw[sys.intern(cmd)] = (f"ERROR: {error_msg}",)
             
             # 如果所有命令都执行成功（没有错误），标记为已执行
             if not errors:
                 executed = True
         
         # 构造统一的 detail
-        detail = CtrlActionDetail(
-            dry_run=dry_run,
-            dangerous=is_dangerous,
-            executed=executed,
-            blocked_reason=blocked_reason,
-            planned=plan,
-            errors=errors,
-            extra=None,
-        )
+        detail = {
+            "dry_run": dry_run,
+            "dangerous": is_dangerous,
+            "executed": executed,
+            "blocked_reason": blocked_reason,
+            "planned": plan,
+            "errors": errors,
+            "extra": None,
+        }
         
-        return CtrlBaseResponse(
+        return CtrlBaseResponse.build_trusted(
             ok=True,
             action=action,
             error=None,
@@ -509,16 +518,16 @@ def _execute_plan(
         )
     except Exception as e:
         # 兜底：任何未预期的异常都转换为 ok=false 的响应
-        detail = CtrlActionDetail(
-            dry_run=True,
-            dangerous=is_dangerous,
-            executed=False,
-            blocked_reason=None,
-            planned=plan,
-            errors=[f"execute_plan failed: {str(e)}"],
-            extra=None,
-        )
-        return CtrlBaseResponse(
+        detail = {
+            "dry_run": True,
+            "dangerous": is_dangerous,
+            "executed": False,
+            "blocked_reason": None,
+            "planned": plan,
+            "errors": [f"execute_plan failed: {str(e)}"],
+            "extra": None,
+        }
+        return CtrlBaseResponse.build_trusted(
             ok=False,
             action=action,
             error=f"ctrl {action} failed: {str(e)}",
@@ -574,39 +583,39 @@ async def ctrl_apn(req: CtrlApnRequest) -> CtrlBaseResponse:
 )
 async def get_roaming() -> RoamingResponse:
     """查询数据漫游状态（使用 AT+QNWPREFCFG="roam_pref"）"""
-    ts = int(time.time() * 1000)
+    ts = _ms_now()
     try:
         enabled, lines = _query_roam_pref()
         if enabled is None:
-            return RoamingResponse(
+            return RoamingResponse.build_trusted(
                 ok=False,
                 ts=ts,
                 error="Modem did not return roam_pref value (AT+QNWPREFCFG=\"roam_pref\" not supported).",
-                roaming=RoamingState(enabled=False),
+                roaming=RoamingState.model_construct(enabled=False),
                 raw=lines,
             )
 
-        return RoamingResponse(
+        return RoamingResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None,
-            roaming=RoamingState(enabled=enabled),
+            roaming=RoamingState.model_construct(enabled=enabled),
             raw=lines,
         )
     except SerialATError as exc:
-        return RoamingResponse(
+        return RoamingResponse.build_trusted(
             ok=False,
             ts=ts,
             error=str(exc),
-            roaming=RoamingState(enabled=False),
+            roaming=RoamingState.model_construct(enabled=False),
             raw=None,
         )
     except Exception as exc:
-        return RoamingResponse(
+        return RoamingResponse.build_trusted(
             ok=False,
             ts=ts,
             error=f"get_roaming failed: {exc}",
-            roaming=RoamingState(enabled=False),
+            roaming=RoamingState.model_construct(enabled=False),
             raw=None,
         )
 
@@ -619,7 +628,7 @@ async def get_roaming() -> RoamingResponse:
 )
 async def ctrl_roaming(req: CtrlRoamingRequest) -> RoamingResponse:
     """设置数据漫游开关（安全动作）"""
-    ts = int(time.time() * 1000)
+    ts = _ms_now()
 
     # dry_run 或 CTRL_ENABLE=0：仅返回计划与当前状态
     if req.dry_run or not CTRL_ENABLE:
@@ -629,11 +638,11 @@ async def ctrl_roaming(req: CtrlRoamingRequest) -> RoamingResponse:
             enabled = None
         if enabled is None:
             enabled = False
-        return RoamingResponse(
+        return RoamingResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None if req.dry_run else "CTRL_ENABLE=0",
-            roaming=RoamingState(enabled=enabled),
+            roaming=RoamingState.model_construct(enabled=enabled),
             raw=None,
         )
 
@@ -642,34 +651,34 @@ async def ctrl_roaming(req: CtrlRoamingRequest) -> RoamingResponse:
         raw_lines = _at(f'AT+QNWPREFCFG="roam_pref",{pref_val}')
         enabled, confirm_lines = _query_roam_pref()
         if enabled is None:
-            return RoamingResponse(
+            return RoamingResponse.build_trusted(
                 ok=True,
                 ts=ts,
                 error="Roaming preference set but modem did not return confirmation.",
-                roaming=RoamingState(enabled=req.enable),
+                roaming=RoamingState.model_construct(enabled=req.enable),
                 raw=raw_lines,
             )
-        return RoamingResponse(
+        return RoamingResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None,
-            roaming=RoamingState(enabled=enabled),
+            roaming=RoamingState.model_construct(enabled=enabled),
             raw=confirm_lines,
         )
     except SerialATError as exc:
-        return RoamingResponse(
+        return RoamingResponse.build_trusted(
             ok=False,
             ts=ts,
             error=str(exc),
-            roaming=RoamingState(enabled=False),
+            roaming=RoamingState.model_construct(enabled=False),
             raw=None,
         )
     except Exception as exc:
-        return RoamingResponse(
+        return RoamingResponse.build_trusted(
             ok=False,
             ts=ts,
             error=f"ctrl_roaming failed: {exc}",
-            roaming=RoamingState(enabled=False),
+            roaming=RoamingState.model_construct(enabled=False),
             raw=None,
         )
 
@@ -733,39 +742,39 @@ async def ctrl_gnss(req: CtrlGnssRequest) -> CtrlBaseResponse:
 )
 async def get_network_mode() -> NetworkModeResponse:
     """查询网络模式（安全查询）"""
-    ts = int(time.time() * 1000)
+    ts = _ms_now()
     try:
         mode_pref, lines = _query_mode_pref()
         if mode_pref is None:
-            return NetworkModeResponse(
+            return NetworkModeResponse.build_trusted(
                 ok=False,
                 ts=ts,
                 error="Modem did not return mode_pref value (AT+QNWPREFCFG=\"mode_pref\" not supported).",
-                mode=NetworkModeState(mode_pref=None),
+                mode=NetworkModeState.model_construct(mode_pref=None),
                 raw=lines,
             )
         
-        return NetworkModeResponse(
+        return NetworkModeResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None,
-            mode=NetworkModeState(mode_pref=mode_pref),
+            mode=NetworkModeState.model_construct(mode_pref=mode_pref),
             raw=lines,
         )
     except SerialATError as exc:
-        return NetworkModeResponse(
+        return NetworkModeResponse.build_trusted(
             ok=False,
             ts=ts,
             error=str(exc),
-            mode=NetworkModeState(mode_pref=None),
+            mode=NetworkModeState.model_construct(mode_pref=None),
             raw=None,
         )
     except Exception as exc:
-        return NetworkModeResponse(
+        return NetworkModeResponse.build_trusted(
             ok=False,
             ts=ts,
             error=f"get_network_mode failed: {exc}",
-            mode=NetworkModeState(mode_pref=None),
+            mode=NetworkModeState.model_construct(mode_pref=None),
             raw=None,
         )
 
@@ -778,7 +787,7 @@ async def get_network_mode() -> NetworkModeResponse:
 )
 async def ctrl_network_mode(req: CtrlNetworkModeRequest) -> NetworkModeResponse:
     """设置网络模式（安全动作）"""
-    ts = int(time.time() * 1000)
+    ts = _ms_now()
     
     # dry_run 或 CTRL_ENABLE=0：仅返回计划与当前状态
     if req.dry_run or not CTRL_ENABLE:
@@ -788,11 +797,11 @@ async def ctrl_network_mode(req: CtrlNetworkModeRequest) -> NetworkModeResponse:
             mode_pref = None
         if mode_pref is None:
             mode_pref = "AUTO"  # 默认值
-        return NetworkModeResponse(
+        return NetworkModeResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None if req.dry_run else "CTRL_ENABLE=0",
-            mode=NetworkModeState(mode_pref=mode_pref),
+            mode=NetworkModeState.model_construct(mode_pref=mode_pref),
             raw=None,
         )
     
@@ -803,18 +812,18 @@ async def ctrl_network_mode(req: CtrlNetworkModeRequest) -> NetworkModeResponse:
             # 查询确认
             mode_pref, confirm_lines = _query_mode_pref()
             if mode_pref is None:
-                return NetworkModeResponse(
+                return NetworkModeResponse.build_trusted(
                     ok=True,
                     ts=ts,
                     error="Network mode preference set but modem did not return confirmation.",
-                    mode=NetworkModeState(mode_pref=req.mode_pref),
+                    mode=NetworkModeState.model_construct(mode_pref=req.mode_pref),
                     raw=raw_lines,
                 )
-            return NetworkModeResponse(
+            return NetworkModeResponse.build_trusted(
                 ok=True,
                 ts=ts,
                 error=None,
-                mode=NetworkModeState(mode_pref=mode_pref),
+                mode=NetworkModeState.model_construct(mode_pref=mode_pref),
                 raw=confirm_lines,
             )
         else:
@@ -822,27 +831,27 @@ async def ctrl_network_mode(req: CtrlNetworkModeRequest) -> NetworkModeResponse:
             mode_pref, lines = _query_mode_pref()
             if mode_pref is None:
                 mode_pref = "AUTO"
-            return NetworkModeResponse(
+            return NetworkModeResponse.build_trusted(
                 ok=True,
                 ts=ts,
                 error=None,
-                mode=NetworkModeState(mode_pref=mode_pref),
+                mode=NetworkModeState.model_construct(mode_pref=mode_pref),
                 raw=lines,
             )
     except SerialATError as exc:
-        return NetworkModeResponse(
+        return NetworkModeResponse.build_trusted(
             ok=False,
             ts=ts,
             error=str(exc),
-            mode=NetworkModeState(mode_pref=None),
+            mode=NetworkModeState.model_construct(mode_pref=None),
             raw=None,
         )
     except Exception as exc:
-        return NetworkModeResponse(
+        return NetworkModeResponse.build_trusted(
             ok=False,
             ts=ts,
             error=f"ctrl_network_mode failed: {exc}",
-            mode=NetworkModeState(mode_pref=None),
+            mode=NetworkModeState.model_construct(mode_pref=None),
             raw=None,
         )
 
@@ -855,7 +864,7 @@ async def ctrl_network_mode(req: CtrlNetworkModeRequest) -> NetworkModeResponse:
 )
 async def get_band_preference() -> BandPreferenceResponse:
     """查询频段偏好（安全查询）"""
-    ts = int(time.time() * 1000)
+    ts = _ms_now()
     try:
         lte_bands, nsa_bands, nr5g_bands, raw_dict = _query_band_preference()
         
@@ -864,11 +873,11 @@ async def get_band_preference() -> BandPreferenceResponse:
         for cmd, lines in raw_dict.items():
             all_raw.extend(lines)
         
-        return BandPreferenceResponse(
+        return BandPreferenceResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None,
-            bands=BandPreferenceState(
+            bands=BandPreferenceState.model_construct(
                 lte_bands=lte_bands,
                 nsa_nr5g_bands=nsa_bands,
                 nr5g_bands=nr5g_bands,
@@ -876,19 +885,19 @@ async def get_band_preference() -> BandPreferenceResponse:
             raw=all_raw if all_raw else None,
         )
     except SerialATError as exc:
-        return BandPreferenceResponse(
+        return BandPreferenceResponse.build_trusted(
             ok=False,
             ts=ts,
             error=str(exc),
-            bands=BandPreferenceState(),
+            bands=BandPreferenceState.model_construct(),
             raw=None,
         )
     except Exception as exc:
-        return BandPreferenceResponse(
+        return BandPreferenceResponse.build_trusted(
             ok=False,
             ts=ts,
             error=f"get_band_preference failed: {exc}",
-            bands=BandPreferenceState(),
+            bands=BandPreferenceState.model_construct(),
             raw=None,
         )
 
@@ -901,7 +910,7 @@ async def get_band_preference() -> BandPreferenceResponse:
 )
 async def ctrl_band_preference(req: CtrlBandPreferenceRequest) -> BandPreferenceResponse:
     """设置频段偏好（安全动作）"""
-    ts = int(time.time() * 1000)
+    ts = _ms_now()
     
     # dry_run 或 CTRL_ENABLE=0：仅返回计划与当前状态
     if req.dry_run or not CTRL_ENABLE:
@@ -909,11 +918,11 @@ async def ctrl_band_preference(req: CtrlBandPreferenceRequest) -> BandPreference
             lte_bands, nsa_bands, nr5g_bands, _ = _query_band_preference()
         except SerialATError:
             lte_bands = nsa_bands = nr5g_bands = None
-        return BandPreferenceResponse(
+        return BandPreferenceResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None if req.dry_run else "CTRL_ENABLE=0",
-            bands=BandPreferenceState(
+            bands=BandPreferenceState.model_construct(
                 lte_bands=lte_bands,
                 nsa_nr5g_bands=nsa_bands,
                 nr5g_bands=nr5g_bands,
@@ -941,11 +950,11 @@ async def ctrl_band_preference(req: CtrlBandPreferenceRequest) -> BandPreference
         for cmd, lines in confirm_dict.items():
             all_raw.extend(lines)
         
-        return BandPreferenceResponse(
+        return BandPreferenceResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None,
-            bands=BandPreferenceState(
+            bands=BandPreferenceState.model_construct(
                 lte_bands=lte_bands,
                 nsa_nr5g_bands=nsa_bands,
                 nr5g_bands=nr5g_bands,
@@ -953,19 +962,19 @@ async def ctrl_band_preference(req: CtrlBandPreferenceRequest) -> BandPreference
             raw=all_raw if all_raw else None,
         )
     except SerialATError as exc:
-        return BandPreferenceResponse(
+        return BandPreferenceResponse.build_trusted(
             ok=False,
             ts=ts,
             error=str(exc),
-            bands=BandPreferenceState(),
+            bands=BandPreferenceState.model_construct(),
             raw=None,
         )
     except Exception as exc:
-        return BandPreferenceResponse(
+        return BandPreferenceResponse.build_trusted(
             ok=False,
             ts=ts,
             error=f"ctrl_band_preference failed: {exc}",
-            bands=BandPreferenceState(),
+            bands=BandPreferenceState.model_construct(),
             raw=None,
         )
 
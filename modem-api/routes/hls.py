@@ -8,6 +8,7 @@ from fastapi.responses import StreamingResponse
 import requests
 
 import config
+from nvr_client import shared_session
 
 router = APIRouter(tags=["hls"])
 
@@ -39,14 +40,21 @@ def nvr_hls_playlist(
         nvr_url = f"{config.get_nvr_base_url()}/live/{ip}/{profile}/index.m3u8"
         
         # 转发请求到 NVR，使用 stream=True 进行流式传输
-        resp = requests.get(nvr_url, timeout=config.NVR_TIMEOUT, stream=True)
-        resp.raise_for_status()
+        resp = shared_session().get(nvr_url, timeout=config.NVR_TIMEOUT, stream=True)
+        try:
+            resp.raise_for_status()
+        except requests.exceptions.HTTPError:
+            resp.close()  # 上游 4xx/5xx 不会进生成器，这里就把连接归还连接池
+            raise
         
         # 定义生成器函数，逐块传输数据
         def iter_content():
-            for chunk in resp.iter_content(chunk_size=8192):
-                if chunk:
-                    yield chunk
+            try:
+                for chunk in resp.iter_content(chunk_size=8192):
+                    if chunk:
+                        yield chunk
+            finally:
+                resp.close()  # 连接归还连接池
         
         # 返回流式响应，保持原始 Content-Type
         return StreamingResponse(
@@ -94,14 +102,21 @@ def nvr_hls_segment(
         nvr_url = f"{config.get_nvr_base_url()}/live/{ip}/{profile}/{filename}"
         
         # 转发请求到 NVR，使用 stream=True 进行流式传输
-        resp = requests.get(nvr_url, timeout=config.NVR_TIMEOUT, stream=True)
-        resp.raise_for_status()
+        resp = shared_session().get(nvr_url, timeout=config.NVR_TIMEOUT, stream=True)
+        try:
+            resp.raise_for_status()
+        except requests.exceptions.HTTPError:
+            resp.close()  # 上游 4xx/5xx 不会进生成器，这里就把连接归还连接池
+            raise
         
         # 定义生成器函数，逐块传输数据
         def iter_content():
-            for chunk in resp.iter_content(chunk_size=8192):
-                if chunk:
-                    yield chunk
+            try:
+                for chunk in resp.iter_content(chunk_size=8192):
+                    if chunk:
+                        yield chunk
+            finally:
+                resp.close()  # 连接归还连接池
         
         # 返回流式响应，保持原始 Content-Type
         return StreamingResponse(
@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Query
-from typing import List, Dict, Optional,Tuple
+from typing import List, Optional, Tuple
 from core.serial_port import serial_at, SerialATError
-from routes.schemas import InfoResponse, InfoModel, SimModel, ModemModel, UsbSpeedModel
+from routes.schemas import InfoResponse, InfoModel, SimModel, ModemModel, UsbSpeedModel, _ms_now
 import re
-import time
 import traceback
 
 
@@ -11,9 +10,9 @@ router = APIRouter(tags=["info"])
 
 # ---- 工具/解析 ----
 
-def _at(cmd: str) -> List[str]:
-    """统一发送 AT，返回行数组（含 'AT+Xxx' 与 'OK' 行）"""
-    return serial_at.send(cmd)
+def _at(cmd: str) -> Tuple[str, ...]:
+    """统一发送 AT，返回行元组（含 'AT+Xxx' 与 'OK' 行）；verbose 时原样作为 raw（RawLog）"""
+    return tuple(serial_at.send(cmd))
 
 def _first_payload_line(lines: List[str]) -> Optional[str]:
     """取第一条有效负载行：跳过 'AT...' 与 'OK' 与空行"""
@@ -62,12 +61,6 @@ def _parse_cnum(lines: List[str]) -> Optional[str]:
 
     return None
 
-USB_SPEED_LABELS: Dict[str, str] = {
-    "20":  "USB 2.0 high speed, 480 Mbps",
-    "311": "USB 3.1 Gen1, 5 Gbps",
-    "312": "USB 3.1 Gen2, 10 Gbps",
-}
-
 def _parse_usbspeed(lines: List[str]) -> Optional[str]:
     # 形如：+QCFG: "usbspeed","312"
     for ln in lines:
@@ -87,9 +80,9 @@ def _parse_qsimstat(lines: List[str]) -> Tuple[Optional[bool], Optional[bool]]:
     return None, None
 
 
-@router.get("/info", response_model=InfoResponse)
+@router.get("/info", responses={200: {"model": InfoResponse}})
 def get_info(verbose: bool = Query(False, description="是否返回 raw 原始AT回显（1/true 开启）")):
-    ts = int(time.time() * 1000)
+    ts = _ms_now()
     try:
         # --- 执行 AT 指令 ---
         gmi   = _at("AT+GMI")
@@ -103,7 +96,7 @@ def get_info(verbose: bool = Query(False, description="是否返回 raw 原始AT
         usbspeed_raw = _at('AT+QCFG="usbspeed"')
 
         # --- 解析展示字段 ---
-        info = InfoModel(
+        info = InfoModel.model_construct(
             manufacturer=_first_payload_line(gmi),
             model=_first_payload_line(cgmm),
             revision=_first_payload_line(gmr),
@@ -111,7 +104,7 @@ def get_info(verbose: bool = Query(False, description="是否返回 raw 原始AT
         )
 
         sim_enabled, sim_inserted = _parse_qsimstat(qsim)
-        sim = SimModel(
+        sim = SimModel.model_construct(
             imsi=_first_payload_line(cimi),
             iccid=_parse_iccid(iccid),
             msisdn=_parse_cnum(cnum),
@@ -121,11 +114,8 @@ def get_info(verbose: bool = Query(False, description="是否返回 raw 原始AT
 
         usb_code_str = _parse_usbspeed(usbspeed_raw)
         usb_code = int(usb_code_str) if usb_code_str and usb_code_str.isdigit() else None
-        modem = ModemModel(
-            usb=UsbSpeedModel(
-                code=usb_code,
-                label=USB_SPEED_LABELS.get(usb_code_str) if usb_code_str else None,
-            )
+        modem = ModemModel.model_construct(
+            usb=UsbSpeedModel.from_code(usb_code)
         )
 
         raw_payload = None
@@ -142,7 +132,7 @@ def get_info(verbose: bool = Query(False, description="是否返回 raw 原始AT
                 "AT+QSIMSTAT?": qsim,
             }
 
-        return InfoResponse(
+        return InfoResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None,
@@ -150,25 +140,25 @@ def get_info(verbose: bool = Query(False, description="是否返回 raw 原始AT
             sim=sim,
             modem=modem,
             raw=raw_payload,
-        )
+        ).json_response()
     except SerialATError as exc:
-        return InfoResponse(
+        return InfoResponse.build_trusted(
             ok=False,
             ts=ts,
             error=str(exc),
-            info=InfoModel(),
-            sim=SimModel(),
-            modem=ModemModel(),
+            info=InfoModel.model_construct(),
+            sim=SimModel.model_construct(),
+            modem=ModemModel.model_construct(),
             raw=None,
-        )
+        ).json_response()
     except Exception as exc:
         traceback.print_exc()
-        return InfoResponse(
+        return InfoResponse.build_trusted(
             ok=False,
             ts=ts,
             error=f"info failed: {exc}",
-            info=InfoModel(),
-            sim=SimModel(),
-            modem=ModemModel(),
+            info=InfoModel.model_construct(),
+            sim=SimModel.model_construct(),
+            modem=ModemModel.model_construct(),
             raw=None,
-        )
\ No newline at end of file
+        ).json_response()
\ No newline at end of file
@@ -1,14 +1,14 @@
 # routes/live.py
 from fastapi import APIRouter, Query
-from typing import List, Optional, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, Iterable, Literal, Union
 from core.serial_port import serial_at, SerialATError
 from routes.schemas import (
-    LiveResponse,
-    LiveRegModel, LiveModeModel, LiveOperatorModel, LiveSignalModel,
+    LiveResponse, LiveResponseFast, LiveResponseFlat, LiveResponseFlatFull, _ms_now,
+    LiveRegModel, LiveModeModel, LiveOperatorModel, SignalBlock,
     LiveNeighborsModel, LiveCAInfoModel, LiveServingModel,
-    ServingSA, ServingLTE, ServingNSA, ServingNSA_NRPart, CA_Pcc, CA_Scc, NbLTE, NbNR,
-    NeighbourCell, LiveNetDev, LiveSessionModel, PDPContext,
-    RegStatus, CellIdNorm, SignalBlock
+    ServingSA, ServingLTE, ServingNSA, ServingNSA_NRPart, CA_Cell,
+    NeighbourCell, NeighbourCellsColumnar, LiveNetDev, LiveSessionModel,
+    RegStatus, CellIdNorm,
 )
 from routes.serving_parsers import (
     parse_qtemp_lines, parse_qcainfo, parse_qcainfo_scc, parse_qeng_scc_from_serving, 
@@ -18,12 +18,22 @@ from routes.serving_parsers import (
     _try_int_hex, _split_lte_eci, _split_nr_nci, pretty_band,
     rate_quality_lte, rate_quality_nr
 )
+from functools import lru_cache
+import logging
 import re
-import time
-import traceback
+import sys
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["live"])
 
+# 回显里反复出现的枚举串：解析时换成这里的同一个 str 对象，每次响应不再各留一份新串
+_INTERNED: Dict[str, str] = {
+    s: sys.intern(s)
+    for s in ("TDD", "FDD", "NOCONN", "CONNECT", "LIMSRV", "SEARCH", "IP", "IPV6", "IPV4V6")
+}
+_DUPLEX: Dict[str, str] = {s: _INTERNED[s] for s in ("TDD", "FDD")}
+
 # --- runtime safe helpers ---
 def _to_dict_or_default(obj, default):
     try:
@@ -36,18 +46,19 @@ def _to_dict_or_default(obj, default):
 
 
 # --- 通用响应兜底 ---
-def _live_error_response(ts: int, message: str) -> LiveResponse:
-    return LiveResponse(
+def _live_error_response(ts: int, message: str, verbose: bool = False) -> LiveResponseFast:
+    resp_cls = LiveResponse if verbose else LiveResponseFast
+    return resp_cls.build_trusted(
         ok=False,
         ts=ts,
         error=message,
-        reg=LiveRegModel(),
-        mode=LiveModeModel(),
-        operator=LiveOperatorModel(),
-        signal=LiveSignalModel(),
-        serving=LiveServingModel(),
-        neighbors=LiveNeighborsModel(lte=[], nr=[]),
-        ca=LiveCAInfoModel(),
+        reg=LiveRegModel.model_construct(),
+        mode=LiveModeModel.model_construct(),
+        operator=LiveOperatorModel.model_construct(),
+        signal=SignalBlock.model_construct(),
+        serving=LiveServingModel.model_construct(),
+        neighbors=LiveNeighborsModel.model_construct(lte=[], nr=[]),
+        ca=LiveCAInfoModel.model_construct(),
         temps=None,
         neighbours=[],
         netdev=None,
@@ -56,26 +67,29 @@ def _live_error_response(ts: int, message: str) -> LiveResponse:
         serving_norm=None,
         signal_lte=None,
         signal_nr=None,
-        raw=None,
     )
 
 
 # ---------- 串口与工具 ----------
 
-def _at(cmd: str) -> List[str]:
-    return serial_at.send(cmd)
+# 回显在这里统一 strip 并丢掉空行，下面的解析器拿到的都是已去空白的行
+def _at(cmd: str) -> Tuple[str, ...]:
+    # tuple：解析器只读，verbose 时原样放进 raw，不用再复制
+    return tuple(s for s in (ln.strip() for ln in serial_at.send(cmd)) if s)
+
+def _at_iter(cmd: str) -> Iterable[str]:
+    # 只被扫一遍的回显用迭代器，不落地成 List
+    return (s for s in (ln.strip() for ln in serial_at.iter_send(cmd)) if s)
 
 def _first_payload_line(lines: List[str]) -> Optional[str]:
-    for ln in lines:
-        s = ln.strip()
-        if not s or s.startswith("AT+") or s == "OK":
+    for s in lines:
+        if s.startswith("AT+") or s == "OK":
             continue
         return s
     return None
 
 def _find_line(lines: List[str], prefix: str) -> Optional[str]:
-    for ln in lines:
-        s = ln.strip()
+    for s in lines:
         if s.startswith(prefix):
             return s
     return None
@@ -87,20 +101,30 @@ def _split_csv(line: str) -> List[str]:
     return [t.strip().strip('"') for t in toks]
 
 def _to_int(s: Optional[str]) -> Optional[int]:
-    if s is None or s == "":
+    if not s:
         return None
+    # 快路径：纯数字直接转；首字符就能判否的（状态字、制式、十六进制 ID 等）不走异常
+    if isinstance(s, str):
+        if s.isdecimal():
+            return int(s)
+        c0 = s[0]
+        if not (c0.isdecimal() or c0 in "+-" or c0.isspace()):
+            return None
     try:
         return int(s)
-    except Exception:
+    except (TypeError, ValueError):
         return None
 
+# 纯 16 进制判定：int(s, 16) 还会接受符号、空白、下划线，必须先过这一关
+_HEX_RE = re.compile(r"[0-9A-Fa-f]+")
+
 def _to_int_hex(s: Optional[str]) -> Optional[int]:
-    if s is None or s == "":
+    if not s:
         return None
     try:
         # 兼容纯 16 进制/带 0x
-        return int(s, 16) if re.fullmatch(r"[0-9A-Fa-f]+", s) else int(s, 0)
-    except Exception:
+        return int(s, 16) if _HEX_RE.fullmatch(s) else int(s, 0)
+    except (TypeError, ValueError):
         return None
 
 def _v(x: Optional[int]) -> Optional[int]:
@@ -108,54 +132,60 @@ def _v(x: Optional[int]) -> Optional[int]:
 
 # === NEW HELPERS (robust casting & small utils) ===
 def _to_int_or_none(v):
-    try:
-        if v is None:
-            return None
-        iv = int(str(v).strip())
-        if iv in (-32768, -32767):
+    if v is None:
+        return None
+    s = (v if isinstance(v, str) else str(v)).strip()
+    if not s:
+        return None
+    # 快路径：纯数字/带符号数字直接转；空字段、"-"、引号串等首字符就能判否，不走异常
+    c0 = s[0]
+    if s.isdecimal() or (c0 in "+-" and s[1:].isdecimal()):
+        iv = int(s)
+    elif c0.isdecimal() or c0 in "+-":
+        try:
+            iv = int(s)  # 少见写法（如 1_000）交给 int() 判断
+        except ValueError:
             return None
-        return iv
-    except Exception:
+    else:
+        return None
+    if iv in (-32768, -32767):
         return None
+    return iv
 
 
-def _find_token_index(toks, *keys):
-    up = [str(x).upper() for x in toks]
-    for k in keys:
-        k = str(k).upper()
-        if k in up:
-            return up.index(k)
-    return None
+# SCS 编码是 0..4 的稠密小整数，直接按下标取
+_SCS_KHZ = (15, 30, 60, 120, 240)
 
-_SCS_CODE_TO_KHZ = {0: 15, 1: 30, 2: 60, 3: 120, 4: 240}
+# 一个 CSV 段：""（转义）| "..."（引号段，可不闭合）| 引号外的普通字符
+_CSV_TOKEN_RE = re.compile(r'(?:""|"(?:""|[^"])*"?|[^",])*')
 
-def _split_csv_tokens(payload: str) -> List[str]:
+# 轮询时同一行回显经常原样重复（信号没变），按原始字符串缓存切分结果；
+# 返回 tuple 以免调用方改动缓存里的对象。命中率可看 _split_csv_tokens.cache_info()
+@lru_cache(maxsize=512)
+def _split_csv_tokens(payload: str) -> Tuple[str, ...]:
     s = payload.strip()
+    # 快路径：没有 "" 转义，且每段引号成对（逗号都不在引号内）时，
+    # 逐字符状态机的结果就是按逗号切开、去掉引号再 strip，交给 C 层的 split/replace
+    if '""' not in s:
+        parts = s.split(",")
+        if '"' not in s:
+            return tuple(t.strip() for t in parts)
+        if all(t.count('"') % 2 == 0 for t in parts):
+            return tuple(t.replace('"', "").strip() for t in parts)
+
+    # 慢路径：正则一次取一整段 token（引号内的逗号不断开），不再逐字符走 Python 循环；
+    # "" 不论在不在引号内都是转义成一个引号，其余引号只负责开合、不进结果
     tokens: List[str] = []
-    buf: List[str] = []
-    in_quote = False
-    i = 0
     n = len(s)
-    while i < n:
-        ch = s[i]
-        if ch == '"':
-            # 处理转义的双引号 "" -> 一个双引号
-            if i + 1 < n and s[i + 1] == '"':
-                buf.append('"')
-                i += 2
-                continue
-            in_quote = not in_quote
-            i += 1
-            continue
-        if ch == ',' and not in_quote:
-            tokens.append(''.join(buf).strip())
-            buf.clear()
-            i += 1
-            continue
-        buf.append(ch)
-        i += 1
-    # 收尾
-    tokens.append(''.join(buf).strip())
+    pos = 0
+    while True:
+        m = _CSV_TOKEN_RE.match(s, pos)
+        tok = m.group()
+        tokens.append('"'.join(p.replace('"', "") for p in tok.split('""')).strip())
+        pos = m.end()
+        if pos >= n:
+            break
+        pos += 1  # 跳过分隔逗号
 
     # 去掉外围引号，例如 "LTE" -> LTE；空串保持为空
     cleaned: List[str] = []
@@ -164,10 +194,13 @@ def _split_csv_tokens(payload: str) -> List[str]:
         if len(t) >= 2 and t[0] == '"' and t[-1] == '"':
             t = t[1:-1]
         cleaned.append(t)
-    return cleaned
+    return tuple(cleaned)
 
 # ---------- 解析 ----------
 
+# +CGREG stat 0..5 -> ps 文本
+_CGREG_PS = ("not_registered", "home", "searching", "denied", "unknown", "roaming")
+
 def _parse_cgreg(lines: List[str]) -> LiveRegModel:
     s = _find_line(lines, "+CGREG:")
     ps = None
@@ -175,16 +208,9 @@ def _parse_cgreg(lines: List[str]) -> LiveRegModel:
         toks = _split_csv(s)
         if len(toks) >= 2:
             stat = _to_int(toks[1])
-            mp = {
-                0: "not_registered",
-                1: "home",
-                2: "searching",
-                3: "denied",
-                4: "unknown",
-                5: "roaming",
-            }
-            ps = mp.get(stat, None)
-    return LiveRegModel(cs=None, ps=ps)
+            if stat is not None and 0 <= stat < 6:
+                ps = _CGREG_PS[stat]
+    return LiveRegModel.model_construct(cs=None, ps=ps)
 
 def _parse_qnwinfo(lines: List[str]) -> Tuple[LiveModeModel, LiveOperatorModel]:
     s = _find_line(lines, "+QNWINFO:")
@@ -205,7 +231,7 @@ def _parse_qnwinfo(lines: List[str]) -> Tuple[LiveModeModel, LiveOperatorModel]:
                 rat = "SA" if "NR5G" in rat_full else rat_full or None
             if len(toks) >= 2:
                 oper_name = toks[1] or None
-    return LiveModeModel(rat=rat, duplex=duplex), LiveOperatorModel(name=oper_name, mcc=None, mnc=None)
+    return LiveModeModel.model_construct(rat=rat, duplex=duplex), LiveOperatorModel.model_construct(name=oper_name, mcc=None, mnc=None)
 
 def _parse_qrsrp(lines: List[str]) -> Optional[int]:
     s = _find_line(lines, "+QRSRP:")
@@ -228,12 +254,12 @@ def _parse_qsinr(lines: List[str]) -> Optional[int]:
     toks = _split_csv(s)
     return _v(_to_int(toks[0] if toks else None))
 
-def _parse_qeng_serving_sa(lines: List[str]) -> Tuple[str, Optional[ServingSA], Optional[str], Optional[str], Optional[str]]:
+def _parse_qeng_serving_sa(s: Optional[str]) -> Tuple[str, Optional[ServingSA], Optional[str], Optional[str], Optional[str]]:
     """
     +QENG: "servingcell","<state>","NR5G-SA","<duplex>","<MCC>","<MNC>","<cellID>","<PCID>",<TAC>,<ARFCN>,<band>,<NR_DL_bw>,<RSRP>,<RSRQ>,<SINR>,<scs>,<srxlev>
+    s: _classify_serving_lines 选出的第一条 servingcell 行
     返回: (rat, sa_obj, mcc, mnc, duplex)
     """
-    s = _find_line(lines, '+QENG: "servingcell"')
     if not s:
         return "UNKNOWN", None, None, None, None
 
@@ -241,27 +267,32 @@ def _parse_qeng_serving_sa(lines: List[str]) -> Tuple[str, Optional[ServingSA],
     if len(toks) < 17:
         return "UNKNOWN", None, None, None, None
 
-    state   = toks[1] or None
+    _in = _INTERNED.get
+    state   = _in(toks[1], toks[1]) or None
     rat_str = (toks[2] or "").upper()
     if "NR5G" not in rat_str:
         return "UNKNOWN", None, None, None, None
 
-    duplex  = toks[3] or None
+    # 热路径：全局名一次性绑定为局部变量
+    _int = _to_int; _hex = _to_int_hex; _vv = _v; _scs = _SCS_KHZ
+
+    duplex  = _in(toks[3], toks[3]) or None
     mcc_str = toks[4] or None
     mnc_str = toks[5] or None
-    cellid  = _to_int_hex(toks[6])
-    pcid    = _to_int(toks[7])
+    cellid  = _hex(toks[6])
+    pcid    = _int(toks[7])
     tac_str = toks[8] or None                  # 你的 schema 里 tac= str
-    nrarfcn = _to_int(toks[9])
+    nrarfcn = _int(toks[9])
     band    = toks[10] or None
-    dl_bw   = _to_int(toks[11])
-    rsrp    = _v(_to_int(toks[12]))
-    rsrq    = _v(_to_int(toks[13]))
-    sinr    = _v(_to_int(toks[14]))
-    scs_khz = _SCS_CODE_TO_KHZ.get(_to_int(toks[15]), None)
-    srxlev  = _to_int(toks[16])
-
-    sa_obj = ServingSA(
+    dl_bw   = _int(toks[11])
+    rsrp    = _vv(_int(toks[12]))
+    rsrq    = _vv(_int(toks[13]))
+    sinr    = _vv(_int(toks[14]))
+    _code   = _int(toks[15])
+    scs_khz = _scs[_code] if _code is not None and 0 <= _code < 5 else None
+    srxlev  = _int(toks[16])
+
+    sa_obj = ServingSA.model_construct(
         state=state, duplex=duplex, mcc=mcc_str, mnc=mnc_str,
         cellid=cellid, pcid=pcid, tac=tac_str, nrarfcn=nrarfcn, band=band,
         dl_bw_mhz=dl_bw, rsrp=rsrp, rsrq=rsrq, sinr=sinr, scs_khz=scs_khz, srxlev=srxlev
@@ -270,43 +301,55 @@ def _parse_qeng_serving_sa(lines: List[str]) -> Tuple[str, Optional[ServingSA],
 
 # ---------- 路由 ----------
 
-@router.get("/live", response_model=LiveResponse)
-def get_live(verbose: bool = Query(False, description="是否返回 raw 原始AT回显(1/true 开启)")):
-    ts = int(time.time() * 1000)
+# 响应体按 verbose / shape 四选一：只有 verbose=1 才带 raw
+_LIVE_200_MODEL = Union[LiveResponseFast, LiveResponse, LiveResponseFlat, LiveResponseFlatFull]
+
+
+@router.get("/live", responses={200: {"model": _LIVE_200_MODEL}})
+def get_live(
+    verbose: bool = Query(False, description="是否返回 raw 原始AT回显(1/true 开启)"),
+    shape: Literal["nested", "flat"] = Query("nested", description="serving 结构：nested（默认）或 flat（sa_*/id_* 扁平字段）"),
+    layout: Literal["aos", "soa"] = Query("aos", description="neighbours 结构：aos（默认，逐行）或 soa（按字段分列）"),
+):
+    ts = _ms_now()
     try:
-        return _build_live_response(verbose, ts)
+        resp = _build_live_response(verbose, ts, layout)
     except SerialATError as exc:
-        return _live_error_response(ts, str(exc))
+        resp = _live_error_response(ts, str(exc), verbose)
     except Exception as exc:
-        traceback.print_exc()
-        return _live_error_response(ts, f"live failed: {exc}")
+        logger.exception("live failed")
+        resp = _live_error_response(ts, f"live failed: {exc}", verbose)
+    if shape == "flat":
+        resp = LiveResponseFlat.from_live(resp)
+    return resp.json_response()
 
 
-def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
+def _build_live_response(verbose: bool, ts: int, layout: str = "aos") -> LiveResponseFast:
     # 1. AT 指令
-    cgreg   = _at("AT+CGREG?")
-    cereg   = _at("AT+CEREG?")  # EPS 注册状态
-    c5greg  = _at("AT+C5GREG?")  # 5G 注册状态
-    qnwinfo = _at("AT+QNWINFO")
-    qrsrp   = _at("AT+QRSRP")
-    qrsrq   = _at("AT+QRSRQ")
+    # 下面用 _once 的回显只被一个解析器扫一遍；verbose 要回填 raw，仍取 List
+    _once = _at if verbose else _at_iter
+    cgreg   = _once("AT+CGREG?")
+    cereg   = _once("AT+CEREG?")  # EPS 注册状态
+    c5greg  = _once("AT+C5GREG?")  # 5G 注册状态
+    qnwinfo = _once("AT+QNWINFO")
+    qrsrp   = _once("AT+QRSRP")
+    qrsrq   = _once("AT+QRSRQ")
     qcainfo = _at("AT+QCAINFO")
-    qeng_serv = _at('AT+QENG="servingcell"')
-    qsinr   = _at("AT+QSINR")
+    qsinr   = _once("AT+QSINR")
     qeng    = _at('AT+QENG="servingcell"')
-    qtemp   = _at("AT+QTEMP")  # 温度数据
-    qnetdev  = _at("AT+QNETDEVSTATUS")  # NetDev 状态
-    cgdcont  = _at("AT+CGDCONT?")  # PDP 上下文配置
-    cgact    = _at("AT+CGACT?")  # PDP 激活状态
-    cgcontrdp = _at("AT+CGCONTRDP?")  # PDP 上下文详情
-    qidnscfg = _at("AT+QIDNSCFG?")  # DNS 配置
+    qtemp   = _once("AT+QTEMP")  # 温度数据
+    qnetdev  = _once("AT+QNETDEVSTATUS")  # NetDev 状态
+    cgdcont  = _once("AT+CGDCONT?")  # PDP 上下文配置
+    cgact    = _once("AT+CGACT?")  # PDP 激活状态
+    cgcontrdp = _once("AT+CGCONTRDP?")  # PDP 上下文详情
+    qidnscfg = _once("AT+QIDNSCFG?")  # DNS 配置
 
     qeng_nb  = _at(r'AT+QENG="neighbourcell"')
 
     # 2. 通用字段
     reg  = _parse_cgreg(cgreg)
     mode, operator = _parse_qnwinfo(qnwinfo)
-    signal = LiveSignalModel(
+    signal = SignalBlock.model_construct(
         rsrp=_parse_qrsrp(qrsrp),
         rsrq=_parse_qrsrq(qrsrq),
         rssi=None,
@@ -314,12 +357,12 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
         cqi=None,
     )
 
-    # 3. Serving Cell 解析（支持 SA/NSA/LTE 所有模式）
-    rat, sa_obj, lte_obj, nsa_lte_obj, nsa_nr_obj, sa_mcc, sa_mnc, sa_duplex = _try_parse_serving_all(qeng)
+    # 3. Serving Cell 解析（支持 SA/NSA/LTE 所有模式；常见的 SA 一次命中）
+    rat, sa_obj, lte_obj, nsa_lte_obj, nsa_nr_obj, sa_mcc, sa_mnc, sa_duplex = _try_parse_serving_all(qeng, mode.rat)
     
     # 根据解析结果构建 serving 模型
     if rat == "SA" and sa_obj is not None:
-        serving = LiveServingModel(rat="SA", sa=sa_obj, lte=None, nsa=None, nsa_nr=None)
+        serving = LiveServingModel.model_construct(rat="SA", sa=sa_obj, lte=None, nsa=None, nsa_nr=None)
         # operator 兜底
         if operator.mcc is None and sa_mcc is not None:
             operator.mcc = sa_mcc
@@ -330,28 +373,37 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
         if mode.rat is None:
             mode.rat = "SA"
     elif rat == "NSA" and (nsa_lte_obj is not None or nsa_nr_obj is not None):
-        serving = LiveServingModel(rat="NSA", sa=None, lte=None, nsa=nsa_lte_obj, nsa_nr=nsa_nr_obj)
+        serving = LiveServingModel.model_construct(rat="NSA", sa=None, lte=None, nsa=nsa_lte_obj, nsa_nr=nsa_nr_obj)
         if mode.rat is None:
             mode.rat = "NSA"
     elif rat == "LTE" and lte_obj is not None:
-        serving = LiveServingModel(rat="LTE", sa=None, lte=lte_obj, nsa=None, nsa_nr=None)
+        serving = LiveServingModel.model_construct(rat="LTE", sa=None, lte=lte_obj, nsa=None, nsa_nr=None)
         if mode.rat is None:
             mode.rat = "LTE"
     else:
-        serving = LiveServingModel(rat=mode.rat, sa=None, lte=None, nsa=None, nsa_nr=None)
+        serving = LiveServingModel.model_construct(rat=mode.rat, sa=None, lte=None, nsa=None, nsa_nr=None)
 
     # 4. Neighbors（邻区）解析
-    nb_lte_dicts = _parse_qeng_neighbor_lte(qeng_nb)
-    nb_nr_dicts = _parse_qeng_neighbor_nr(qeng_nb)
-    nb_lte_models = [NbLTE(**d) for d in nb_lte_dicts]
-    nb_nr_models = [NbNR(**d) for d in nb_nr_dicts]
-    neighbors = LiveNeighborsModel(lte=nb_lte_models, nr=nb_nr_models)
+    # 解析器按列返回（已完成类型转换），这里直接 zip 成 dict（NbLTETD / NbNRTD），不逐个构造模型
+    # 先筛一遍邻区行，列解析和下面的 neighbours 都只看这份短列表（跳过回显/OK/空行）
+    qeng_nb_lines = _filter_neighbour_lines(qeng_nb)
+    nb_lte_cols, nb_nr_cols = _parse_qeng_neighbor_cols_text("\n".join(qeng_nb_lines))
+    nb_lte_models = [
+        {"earfcn": a, "pci": p, "rsrp": r, "rsrq": q, "sinr": si, "srxlev": sx}
+        for a, p, r, q, si, sx in zip(*(nb_lte_cols[k] for k in _NB_LTE_COLS))
+    ]
+    nb_nr_models = [
+        {"nrarfcn": a, "pci": p, "rsrp": r, "rsrq": q, "sinr": si, "scs_khz": scs}
+        for a, p, r, q, si, scs in zip(*(nb_nr_cols[k] for k in _NB_NR_COLS))
+    ]
+    neighbors = LiveNeighborsModel.model_construct(lte=nb_lte_models, nr=nb_nr_models)
 
     # 5. CA & 温度占位
-    ca_info = LiveCAInfoModel()
+    ca_info = LiveCAInfoModel.model_construct()
     
-    # 7. 组装响应
-    resp = LiveResponse(
+    # 7. 组装响应：只有 verbose 才用带 raw 的完整模型
+    resp_cls = LiveResponse if verbose else LiveResponseFast
+    resp = resp_cls.model_construct(
         ok=True,
         ts=ts,
         error=None,
@@ -362,55 +414,26 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
         serving=serving,
         neighbors=neighbors,
         ca=ca_info,
-        raw=None,
     )
 
-    if verbose:
-        resp.raw = {
-            "AT+CGREG?": cgreg,
-            "AT+CEREG?": cereg,
-            "AT+C5GREG?": c5greg,
-            "AT+QNWINFO": qnwinfo,
-            "AT+QRSRP": qrsrp,
-            "AT+QRSRQ": qrsrq,
-            "AT+QSINR": qsinr,
-            'AT+QENG="servingcell"': qeng,
-            'AT+QENG="servingcell"': qeng_serv,
-            r'AT+QENG="neighbourcell"': qeng_nb,
-            "AT+QCAINFO": qcainfo,
-            "AT+QTEMP": qtemp,
-            "AT+QNETDEVSTATUS": qnetdev,
-            "AT+CGDCONT?": cgdcont,
-            "AT+CGACT?": cgact,
-            "AT+CGCONTRDP?": cgcontrdp,
-            "AT+QIDNSCFG?": qidnscfg,
-        }
-
-    raw_data = resp.raw if isinstance(resp.raw, dict) else {}
-
     # ---- fill temps from AT+QTEMP ----
     temps_payload = {"ambient": None, "mmw": None, "pa": {}, "baseband": {}, "raw": {}}
     try:
-        at_qtemp_lines = raw_data.get("AT+QTEMP", []) if raw_data else []
-        if not at_qtemp_lines:
-            at_qtemp_lines = qtemp
-        temps_payload = parse_qtemp_lines(at_qtemp_lines)
+        temps_payload = parse_qtemp_lines(qtemp)
     except Exception:
         pass
     resp.temps = temps_payload
 
     # ---- fill CA from AT+QCAINFO ----
     try:
-        at_qcainfo_lines = raw_data.get("AT+QCAINFO", []) if raw_data else []
-        if not at_qcainfo_lines:
-            at_qcainfo_lines = qcainfo
-        pcc_dict, _ = parse_qcainfo(at_qcainfo_lines)
-        ca_base = resp.ca or LiveCAInfoModel()
-        ca_obj = ca_base.model_dump() if isinstance(ca_base, LiveCAInfoModel) else dict(ca_base)
+        pcc_dict, _ = parse_qcainfo(qcainfo)
+        # 中间结果一直是已构造好的对象，浅拷字段即可，不走 model_dump 再重建
+        ca_base = resp.ca or LiveCAInfoModel.model_construct()
+        ca_obj = {name: getattr(ca_base, name, None) for name in LiveCAInfoModel.model_fields}
         pcc_model = None
         if pcc_dict:
             try:
-                pcc_model = CA_Pcc(
+                pcc_model = CA_Cell.model_construct(
                     arfcn=pcc_dict.get("earfcn"),
                     dl_bw_mhz=pcc_dict.get("dl_bw_mhz"),
                     band=pcc_dict.get("band"),
@@ -426,21 +449,18 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
         # --- CA.SCC fill (safe; never raise) ---
         scc_list = []
         try:
-            scc_list = parse_qcainfo_scc(at_qcainfo_lines)
+            scc_list = parse_qcainfo_scc(qcainfo)
             if not scc_list:
                 # fallback from QENG serving if needed
-                qeng_serv = raw_data.get('AT+QENG="servingcell"', []) if raw_data else []
-                if not qeng_serv:
-                    qeng_serv = qeng
-                scc_list = parse_qeng_scc_from_serving(qeng_serv)
+                scc_list = parse_qeng_scc_from_serving(qeng)
         except Exception:
             pass
         
-        # Convert SCC dicts to CA_Scc models, mapping cc_idx -> idx
+        # Convert SCC dicts to CA_Cell models, mapping cc_idx -> idx
         ca_obj["scc"] = []
         for scc_item in scc_list:
             try:
-                # Map cc_idx to idx for CA_Scc model
+                # Map cc_idx to idx for CA_Cell model
                 scc_dict = {
                     "idx": scc_item.get("cc_idx", 0),
                     "band": scc_item.get("band"),
@@ -451,14 +471,14 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
                     "sinr": scc_item.get("sinr"),
                     "rat": None,  # Could be inferred from band/earfcn/nrarfcn if needed
                 }
-                ca_obj["scc"].append(CA_Scc(**scc_dict))
+                ca_obj["scc"].append(CA_Cell.model_construct(**scc_dict))
             except Exception:
                 continue
-        resp.ca = LiveCAInfoModel(**ca_obj)
+        resp.ca = LiveCAInfoModel.model_construct(**ca_obj)
     except Exception:
         # 任何异常都不要影响主流程
         if resp.ca is None:
-            resp.ca = LiveCAInfoModel()
+            resp.ca = LiveCAInfoModel.model_construct()
         if not hasattr(resp.ca, "scc") or resp.ca.scc is None:
             resp.ca.scc = []
 
@@ -478,23 +498,17 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
     # ---- fill neighbours from AT+QENG="neighbourcell" ----
     neigh_list = []
     try:
-        at_qeng_nb_lines = raw_data.get(r'AT+QENG="neighbourcell"', []) if raw_data else []
-        if not at_qeng_nb_lines:
-            at_qeng_nb_lines = qeng_nb
-        neigh_list = parse_qeng_neighbour(at_qeng_nb_lines)
+        neigh_list = parse_qeng_neighbour(qeng_nb_lines)
     except Exception:
         neigh_list = []
-    resp.neighbours = [NeighbourCell(**n) for n in neigh_list] if neigh_list else []
+    if layout == "soa":
+        resp.neighbours = NeighbourCellsColumnar.from_rows(neigh_list)
+    else:
+        resp.neighbours = [NeighbourCell.model_construct(**n) for n in neigh_list]
 
     # --- NetDev: QNETDEVSTATUS -> fallback sysfs, then compute rates ---
     try:
-        raw = resp.raw if hasattr(resp, "raw") else None
-        lines = None
-        if raw and isinstance(raw, dict):
-            lines = raw.get("AT+QNETDEVSTATUS")
-        nd = None
-        if lines:
-            nd = parse_qnetdevstatus(lines)
+        nd = parse_qnetdevstatus(qnetdev)
         if not nd:
             nd = probe_sys_netdev()
         if nd:
@@ -504,17 +518,16 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
                 for k, v in nd.items():
                     setattr(resp.netdev, k, v)
             else:
-                resp.netdev = LiveNetDev(**nd)
+                resp.netdev = LiveNetDev.model_construct(**nd)
     except Exception as _:
         pass
 
     # --- Session: PDP/APN/DNS via CGCONTRDP/CGACT/CGDCONT/QIDNSCFG ---
     try:
-        raw = resp.raw if hasattr(resp, "raw") else None
-        cgdc = parse_cgdcont(raw.get("AT+CGDCONT?") if raw and isinstance(raw, dict) else [])
-        cgac = parse_cgact(raw.get("AT+CGACT?") if raw and isinstance(raw, dict) else [])
-        cgco = parse_cgcontrdp(raw.get("AT+CGCONTRDP?") if raw and isinstance(raw, dict) else [])
-        qdns = parse_qidnscfg(raw.get("AT+QIDNSCFG?") if raw and isinstance(raw, dict) else [])
+        cgdc = parse_cgdcont(cgdcont)
+        cgac = parse_cgact(cgact)
+        cgco = parse_cgcontrdp(cgcontrdp)
+        qdns = parse_qidnscfg(qidnscfg)
         # 合并到 CID 维度
         cids = set(cgdc.keys()) | set(cgac.keys()) | set(cgco.keys())
         pdp_list = []
@@ -524,37 +537,34 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
             # 补 DNS（若 AT+CGCONTRDP 没给出）
             d.setdefault("dns1", qdns.get("dns1"))
             d.setdefault("dns2", qdns.get("dns2"))
-            pdp_list.append(PDPContext(
-                cid=cid,
-                type=d.get("type"),
-                apn=d.get("apn"),
-                state=d.get("state"),
-                ip=d.get("ip"),
-                dns1=d.get("dns1"),
-                dns2=d.get("dns2"),
-            ))
+            pdp_list.append({
+                "cid": cid,
+                "type": _INTERNED.get(d.get("type"), d.get("type")),
+                "apn": d.get("apn"),
+                "state": d.get("state"),
+                "ip": d.get("ip"),
+                "dns1": d.get("dns1"),
+                "dns2": d.get("dns2"),
+            })
         if pdp_list:
             # default_cid：优先取 state=1 的最小 cid
             default_cid = None
             for p in pdp_list:
-                if p.state == 1:
-                    default_cid = p.cid
+                if p["state"] == 1:
+                    default_cid = p["cid"]
                     break
-            resp.session = LiveSessionModel(default_cid=default_cid, pdp=pdp_list)
+            resp.session = LiveSessionModel.model_construct(default_cid=default_cid, pdp=pdp_list)
     except Exception:
         pass
 
     # --- Registration & Serving Cell Normalization ---
     try:
-        raw = resp.raw if hasattr(resp, "raw") else None
-        raw_dict = raw if isinstance(raw, dict) else {}
-        
         # 解析注册状态
-        eps_stat = parse_cereg_stat(raw_dict.get("AT+CEREG?", []))
-        nr5g_stat = parse_c5greg_stat(raw_dict.get("AT+C5GREG?", []))
+        eps_stat = parse_cereg_stat(cereg)
+        nr5g_stat = parse_c5greg_stat(c5greg)
         
         if eps_stat is not None or nr5g_stat is not None:
-            resp.reg_detail = RegStatus(
+            resp.reg_detail = RegStatus.model_construct(
                 eps=eps_stat,
                 nr5g=nr5g_stat,
                 eps_text=reg_text(eps_stat),
@@ -562,12 +572,7 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
             )
         
         # 解析 serving cell 核心信息
-        qeng_serving_lines = raw_dict.get('AT+QENG="servingcell"', [])
-        if not qeng_serving_lines:
-            # 尝试从其他变量获取
-            qeng_serving_lines = qeng if 'qeng' in locals() else []
-        
-        serving_core = parse_qeng_serving_core(qeng_serving_lines)
+        serving_core = parse_qeng_serving_core(qeng)
         
         if serving_core:
             rat = serving_core.get("rat")
@@ -575,7 +580,7 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
             tac_dec = _try_int_hex(tac_hex) if tac_hex else None
             
             # 构建 CellIdNorm
-            cell_id_norm = CellIdNorm(
+            cell_id_norm = CellIdNorm.model_construct(
                 tac_hex=tac_hex,
                 tac_dec=tac_dec,
                 rat=rat,
@@ -642,19 +647,16 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
             band = pretty_band(rat, band)
             
             # 组装 serving_norm
-            resp.serving_norm = LiveServingModel(
+            resp.serving_norm = LiveServingModel.model_construct(
                 rat=rat,
                 band=band,
                 arfcn=arfcn,
                 pci=pci,
                 id=cell_id_norm,
             )
-    except Exception as e:
-        # 调试用：打印异常信息
-        import traceback
-        print(f"[live] Registration & Serving normalization error: {e}")
-        traceback.print_exc()
-        pass
+    except Exception:
+        # 模组回显不完整时会频繁走到这里，只在 DEBUG 级别带堆栈
+        logger.debug("live normalization failed", exc_info=True)
 
     # --- Step-9: Separate LTE & NR Signal Blocks ---
     try:
@@ -742,34 +744,54 @@ def _build_live_response(verbose: bool, ts: int) -> LiveResponse:
         
         # 组装 SignalBlock
         if lte_rsrp is not None or lte_rsrq is not None or lte_sinr is not None or lte_rssi is not None:
-            resp.signal_lte = SignalBlock(
-                rssi=lte_rssi,
-                rsrp=lte_rsrp,
-                rsrq=lte_rsrq,
-                sinr=lte_sinr,
-                quality=lte_q,
-                note=lte_note,
-            )
+            resp.signal_lte = {
+                "rssi": lte_rssi,
+                "rsrp": lte_rsrp,
+                "rsrq": lte_rsrq,
+                "sinr": lte_sinr,
+                "quality": lte_q,
+                "note": lte_note,
+            }
         
         if nr_rsrp is not None or nr_rsrq is not None or nr_sinr is not None or nr_rssi is not None:
-            resp.signal_nr = SignalBlock(
-                rssi=nr_rssi,
-                rsrp=nr_rsrp,
-                rsrq=nr_rsrq,
-                sinr=nr_sinr,
-                quality=nr_q,
-                note=nr_note,
-            )
-    except Exception as e:
-        import traceback
-        print(f"[live] Signal separation error: {e}")
-        traceback.print_exc()
-        pass
+            resp.signal_nr = {
+                "rssi": nr_rssi,
+                "rsrp": nr_rsrp,
+                "rsrq": nr_rsrq,
+                "sinr": nr_sinr,
+                "quality": nr_q,
+                "note": nr_note,
+            }
+    except Exception:
+        logger.debug("live signal separation failed", exc_info=True)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "live neighbors lte=%d nr=%d neighbours=%d ca_scc=%d",
+            len(nb_lte_models), len(nb_nr_models), len(neigh_list),
+            len(getattr(resp.ca, "scc", []) or []),
+        )
 
-    print(f"[live] neighbors lte={len(nb_lte_dicts)}, nr={len(nb_nr_dicts)}")
-    print(f"[live] neighbours count={len(neigh_list)}")
-    ca_scc_len = len(getattr(resp.ca, "scc", []) or [])
-    print(f"[live] ca scc={ca_scc_len}")
+    # 原始回显只在 verbose 时组装一次
+    if verbose:
+        resp.raw = {
+            "AT+CGREG?": cgreg,
+            "AT+CEREG?": cereg,
+            "AT+C5GREG?": c5greg,
+            "AT+QNWINFO": qnwinfo,
+            "AT+QRSRP": qrsrp,
+            "AT+QRSRQ": qrsrq,
+            "AT+QSINR": qsinr,
+            'AT+QENG="servingcell"': qeng,
+            r'AT+QENG="neighbourcell"': qeng_nb,
+            "AT+QCAINFO": qcainfo,
+            "AT+QTEMP": qtemp,
+            "AT+QNETDEVSTATUS": qnetdev,
+            "AT+CGDCONT?": cgdcont,
+            "AT+CGACT?": cgact,
+            "AT+CGCONTRDP?": cgcontrdp,
+            "AT+QIDNSCFG?": qidnscfg,
+        }
     return resp
 
 
@@ -784,6 +806,7 @@ def _nz(v: Optional[int]) -> Optional[int]:
     except Exception:
         return None
 
+@lru_cache(maxsize=512)
 def _payload_after_first_quoted_tag(line: str) -> str:
     # 取第一对引号后的逗号开始的 payload，例如:
     # +QENG: "servingcell","NOCONN","NR5G-SA",... -> 取到 "NOCONN","NR5G-SA",...
@@ -794,123 +817,158 @@ def _payload_after_first_quoted_tag(line: str) -> str:
         # 兜底：去掉到第一个冒号
         return line.split(":",1)[-1].strip()
 
-def _parse_qeng_serving_lte(lines: List[str]) -> Tuple[str, Optional[ServingLTE]]:
+# 切分 + 整行转 int 一次完成（转不了的字段为 None），按 payload 缓存；
+# 信号不变时同一行回显原样重复，整行解析直接命中，不再逐字段调 _to_int
+@lru_cache(maxsize=256)
+def _payload_ints(payload: str) -> Tuple[Tuple[str, ...], Tuple[Optional[int], ...]]:
+    toks = _split_csv_tokens(payload)
+    return toks, tuple(map(_to_int, toks))
+
+# 整行结果按原始行缓存：状态稳定时轮询回显逐字相同，直接复用上次的模型
+# （下游只读 serving 模型，不会改写缓存里的对象）
+@lru_cache(maxsize=8)
+def _parse_qeng_serving_lte(ln: Optional[str]) -> Tuple[str, Optional[ServingLTE]]:
     """解析 LTE 模式的 +QENG: "servingcell","LTE"... 行"""
-    ln = None
-    for s in lines:
-        if s.strip().startswith('+QENG: "servingcell"') and '"LTE"' in s:
-            ln = s
-            break
     if not ln:
         return "UNKNOWN", None
 
-    payload = _payload_after_first_quoted_tag(ln)
-    toks = _split_csv_tokens(payload)
+    _nzv = _nz
+    toks, iv = _payload_ints(_payload_after_first_quoted_tag(ln))
 
     # 预期: state, "LTE", is_tdd, mcc, mnc, cellid, pcid, earfcn, freq_band_ind, ul_bw, dl_bw, tac, rsrp, rsrq, rssi, sinr, cqi, tx_power, srxlev
     if len(toks) < 19:
         return "UNKNOWN", None
 
-    state   = toks[0]
-    is_tdd  = toks[2] if toks[2] in ("TDD","FDD") else None
-    lte = ServingLTE(
+    state   = _INTERNED.get(toks[0], toks[0])
+    is_tdd  = _DUPLEX.get(toks[2])
+    lte = ServingLTE.model_construct(
         state=state,
         is_tdd=is_tdd,
-        mcc=_to_int(toks[3]),
-        mnc=_to_int(toks[4]),
-        cellid=_to_int(toks[5]),
-        pcid=_to_int(toks[6]),
-        earfcn=_to_int(toks[7]),
-        band=_to_int(toks[8]),
-        ul_bw_mhz=_to_int(toks[9]),
-        dl_bw_mhz=_to_int(toks[10]),
-        tac=_to_int(toks[11]),
-        rsrp=_nz(_to_int(toks[12])),
-        rsrq=_nz(_to_int(toks[13])),
-        rssi=_to_int(toks[14]),
-        sinr=_nz(_to_int(toks[15])),
-        cqi=_to_int(toks[16]),
-        tx_power=_to_int(toks[17]),
-        srxlev=_to_int(toks[18]),
+        mcc=iv[3],
+        mnc=iv[4],
+        cellid=iv[5],
+        pcid=iv[6],
+        earfcn=iv[7],
+        band=iv[8],
+        ul_bw_mhz=iv[9],
+        dl_bw_mhz=iv[10],
+        tac=iv[11],
+        rsrp=_nzv(iv[12]),
+        rsrq=_nzv(iv[13]),
+        rssi=iv[14],
+        sinr=_nzv(iv[15]),
+        cqi=iv[16],
+        tx_power=iv[17],
+        srxlev=iv[18],
     )
     return "LTE", lte
 
-def _parse_qeng_serving_nsa(lines: List[str]) -> Tuple[str, Optional[ServingNSA], Optional[ServingNSA_NRPart]]:
+@lru_cache(maxsize=8)
+def _parse_qeng_serving_nsa(lte_line: Optional[str], nr_line: Optional[str]) -> Tuple[str, Optional[ServingNSA], Optional[ServingNSA_NRPart]]:
     """解析 EN-DC(NR5G-NSA)两行：+QENG: "LTE"... 与 +QENG: "NR5G-NSA"..."""
-    lte_line = None
-    nr_line  = None
-    for s in lines:
-        st = s.strip()
-        if st.startswith('+QENG: "LTE"'):
-            lte_line = s
-        elif st.startswith('+QENG: "NR5G-NSA"'):
-            nr_line = s
     if not lte_line or not nr_line:
         return "UNKNOWN", None, None
 
+    _nzv = _nz; _payload = _payload_after_first_quoted_tag
+
     # LTE 锚点
-    toks_lte = _split_csv_tokens(_payload_after_first_quoted_tag(lte_line))
+    toks_lte, iv_lte = _payload_ints(_payload(lte_line))
     # 预期: "LTE", is_tdd, mcc, mnc, cellid, pcid, earfcn, freq_band_ind, ul_bw, dl_bw, tac, rsrp, rsrq, rssi, sinr, cqi, tx_power, srxlev
     if len(toks_lte) < 18:
         return "UNKNOWN", None, None
 
-    lte = ServingNSA(
-        is_tdd=toks_lte[1] if toks_lte[1] in ("TDD","FDD") else None,
-        mcc=_to_int(toks_lte[2]),
-        mnc=_to_int(toks_lte[3]),
-        cellid=_to_int(toks_lte[4]),
-        pcid=_to_int(toks_lte[5]),
-        earfcn=_to_int(toks_lte[6]),
-        band=_to_int(toks_lte[7]),
-        ul_bw_mhz=_to_int(toks_lte[8]),
-        dl_bw_mhz=_to_int(toks_lte[9]),
-        tac=_to_int(toks_lte[10]),
-        rsrp=_nz(_to_int(toks_lte[11])),
-        rsrq=_nz(_to_int(toks_lte[12])),
-        rssi=_to_int(toks_lte[13]),
-        sinr=_nz(_to_int(toks_lte[14])),
-        cqi=_to_int(toks_lte[15]),
-        tx_power=_to_int(toks_lte[16]),
-        srxlev=_to_int(toks_lte[17]),
+    lte = ServingNSA.model_construct(
+        is_tdd=_DUPLEX.get(toks_lte[1]),
+        mcc=iv_lte[2],
+        mnc=iv_lte[3],
+        cellid=iv_lte[4],
+        pcid=iv_lte[5],
+        earfcn=iv_lte[6],
+        band=iv_lte[7],
+        ul_bw_mhz=iv_lte[8],
+        dl_bw_mhz=iv_lte[9],
+        tac=iv_lte[10],
+        rsrp=_nzv(iv_lte[11]),
+        rsrq=_nzv(iv_lte[12]),
+        rssi=iv_lte[13],
+        sinr=_nzv(iv_lte[14]),
+        cqi=iv_lte[15],
+        tx_power=iv_lte[16],
+        srxlev=iv_lte[17],
     )
 
     # NR 部分
-    toks_nr = _split_csv_tokens(_payload_after_first_quoted_tag(nr_line))
+    toks_nr, iv_nr = _payload_ints(_payload(nr_line))
     # 预期: "NR5G-NSA", mcc, mnc, pcid, rsrp, sinr, rsrq, arfcn, band, nr_dl_bw, scs
     if len(toks_nr) < 11:
         return "UNKNOWN", lte, None
 
-    nr = ServingNSA_NRPart(
-        mcc=_to_int(toks_nr[1]),
-        mnc=_to_int(toks_nr[2]),
-        pcid=_to_int(toks_nr[3]),
-        rsrp=_nz(_to_int(toks_nr[4])),
-        sinr=_nz(_to_int(toks_nr[5])),
-        rsrq=_nz(_to_int(toks_nr[6])),
-        nrarfcn=_to_int(toks_nr[7]),
-        band=_to_int(toks_nr[8]),
-        dl_bw_mhz=_to_int(toks_nr[9]),
-        scs_khz=_to_int(toks_nr[10]),
+    nr = ServingNSA_NRPart.model_construct(
+        mcc=iv_nr[1],
+        mnc=iv_nr[2],
+        pcid=iv_nr[3],
+        rsrp=_nzv(iv_nr[4]),
+        sinr=_nzv(iv_nr[5]),
+        rsrq=_nzv(iv_nr[6]),
+        nrarfcn=iv_nr[7],
+        band=iv_nr[8],
+        dl_bw_mhz=iv_nr[9],
+        scs_khz=iv_nr[10],
     )
     return "NSA", lte, nr
 
-def _try_parse_serving_all(lines: List[str]) -> Tuple[str, Optional[ServingSA], Optional[ServingLTE], Optional[ServingNSA], Optional[ServingNSA_NRPart], Optional[int], Optional[int], Optional[str]]:
-    """依次尝试 SA → NSA → LTE；统一返回"""
-    # 先走已有的 SA 解析(保持向后兼容)
-    rat_sa, sa_obj, sa_mcc, sa_mnc, sa_duplex = _parse_qeng_serving_sa(lines)
+def _classify_serving_lines(lines: List[str]) -> Dict[str, str]:
+    """
+    一次扫描把 servingcell 回显按格式归类，三个解析器直接拿各自的行：
+      SA      第一条 +QENG: "servingcell" 行（是否 NR5G 由 SA 解析器判断）
+      LTE     第一条含 "LTE" 的 servingcell 行
+      LTE_NSA / NR_NSA  EN-DC 的 +QENG: "LTE" / +QENG: "NR5G-NSA" 行（取最后一条）
+    """
+    idx: Dict[str, str] = {}
+    for s in lines:
+        if s.startswith('+QENG: "servingcell"'):
+            if "SA" not in idx:
+                idx["SA"] = s
+            if "LTE" not in idx and '"LTE"' in s:
+                idx["LTE"] = s
+        elif s.startswith('+QENG: "LTE"'):
+            idx["LTE_NSA"] = s
+        elif s.startswith('+QENG: "NR5G-NSA"'):
+            idx["NR_NSA"] = s
+    return idx
+
+def _serving_try_sa(idx: Dict[str, str]):
+    rat_sa, sa_obj, sa_mcc, sa_mnc, sa_duplex = _parse_qeng_serving_sa(idx.get("SA"))
     if rat_sa == "SA" and sa_obj:
         return "SA", sa_obj, None, None, None, sa_mcc, sa_mnc, sa_duplex
+    return None
 
-    # 再试 NSA
-    rat_nsa, nsa_lte_obj, nsa_nr_obj = _parse_qeng_serving_nsa(lines)
+def _serving_try_nsa(idx: Dict[str, str]):
+    rat_nsa, nsa_lte_obj, nsa_nr_obj = _parse_qeng_serving_nsa(idx.get("LTE_NSA"), idx.get("NR_NSA"))
     if rat_nsa == "NSA" and (nsa_lte_obj or nsa_nr_obj):
         return "NSA", None, None, nsa_lte_obj, nsa_nr_obj, None, None, None
+    return None
 
-    # 最后试 LTE
-    rat_lte, lte_obj = _parse_qeng_serving_lte(lines)
+def _serving_try_lte(idx: Dict[str, str]):
+    rat_lte, lte_obj = _parse_qeng_serving_lte(idx.get("LTE"))
     if rat_lte == "LTE" and lte_obj:
         return "LTE", None, lte_obj, None, None, None, None, None
+    return None
 
+# 按 QNWINFO 的 RAT 提示排好尝试顺序；三种回显格式互斥，顺序只影响耗时不影响结果
+_SERVING_ORDER_DEFAULT = (_serving_try_sa, _serving_try_nsa, _serving_try_lte)
+_SERVING_ORDER_BY_HINT = {
+    "SA":  _SERVING_ORDER_DEFAULT,
+    "LTE": (_serving_try_nsa, _serving_try_lte, _serving_try_sa),
+}
+
+def _try_parse_serving_all(lines: List[str], hint: Optional[str] = None) -> Tuple[str, Optional[ServingSA], Optional[ServingLTE], Optional[ServingNSA], Optional[ServingNSA_NRPart], Optional[int], Optional[int], Optional[str]]:
+    """按提示顺序尝试 SA / NSA / LTE（默认 SA → NSA → LTE）；统一返回"""
+    idx = _classify_serving_lines(lines)
+    for attempt in _SERVING_ORDER_BY_HINT.get(hint, _SERVING_ORDER_DEFAULT):
+        got = attempt(idx)
+        if got is not None:
+            return got
     return "UNKNOWN", None, None, None, None, None, None, None
 # ======== /STEP3 ========
 
@@ -920,22 +978,15 @@ def s5__to_int(v):
     try:
         if v is None: return None
         v = v.strip().strip('"').strip("'")
+        if not v:
+            return None  # 空字段最常见，不必走异常
+        if v.isdecimal():
+            return int(v)
         base = 16 if v.startswith(("0x","0X")) else 10
         return int(v, base)
     except Exception:
         return None
 
-def s5__nz(v):
-    # -32768 或空串 统一为 None
-    try:
-        if v is None: return None
-        vv = str(v).strip()
-        if vv == "" or vv == "-32768":
-            return None
-        return v if isinstance(v, (int,float)) else int(v)
-    except Exception:
-        return None
-
 def s5__mhz(v):
     try:
         if v is None: return None
@@ -949,8 +1000,7 @@ def _parse_qcainfo(lines):
     # 兼容多行：每行可能是 PCC 或 SCC
     pcc = None
     scc = []
-    for ln in lines:
-        s = ln.strip()
+    for s in lines:
         if not s.startswith("+QCAINFO:"):
             continue
         # 去掉前缀
@@ -983,61 +1033,22 @@ def _parse_qcainfo(lines):
     return {"pcc": pcc, "scc": scc}
 
 
-# ===== Step5: +QENG="neighbourcell" 解析 =====
-def _parse_qeng_neighbors(lines):
-    # 仅提取 LTE 邻区(intra/inter)，最小子集：rat, earfcn, pcid, rsrp, rsrq
-    items = []
-    for ln in lines:
-        s = ln.strip()
-        if not s.startswith("+QENG:"):
-            continue
-        # 形如：+QENG: "neighbourcell intra","LTE",<earfcn>,<PCID>,<RSRQ>,<RSRP>,...
-        try:
-            # 拆出所有以逗号分隔的段，同时保留前两个字符串字段
-            # 简易做法：先去掉 +QENG: 和引号中的逗号干扰不处理，抓关键位
-            parts = [x.strip() for x in s.split(",")]
-            if len(parts) < 6:
-                continue
-            head = parts[0]  # +QENG: "neighbourcell intra"
-            if '"neighbourcell' not in head:
-                continue
-            rat = parts[1].strip().strip('"').upper()
-            if rat != "LTE":
-                # 先做 LTE，NR 如需后续扩展
-                continue
-            earfcn = s5__to_int(parts[2])
-            pcid = s5__to_int(parts[3])
-            rsrq = s5__nz(parts[4])
-            rsrp = s5__nz(parts[5])
-            item = {
-                "rat": rat,
-                "earfcn": earfcn,
-                "pcid": pcid,
-                "rsrq": rsrq,
-                "rsrp": rsrp,
-            }
-            items.append(item)
-        except Exception:
-            continue
-    # 裁前 5 个，避免冗长
-    if not items:
-        return None
-    return {"lte": items[:5], "nr": []}
-
-
 # ===== Step6 parsers (auto-added) =====
+# 行前缀判断 + 取 payload 合成一条预编译正则，对整段回显扫一遍；
+# payload 规则同 _payload_after_first_quoted_tag：第一个 `",` 之后，没有则取冒号之后
+_QCAINFO_RE = re.compile(r'^[^\S\n]*\+QCAINFO(?:[^\n]*?",|[^\n:]*:)?([^\n]*)', re.M)
+_QENG_NB_RE = re.compile(r'^[^\S\n]*\+QENG:(?=[^\n]*neighbour)(?:[^\n]*?",)?([^\n]*)', re.M)
+
 def _parse_qcainfo(lines: List[str]) -> Tuple[Dict, List[Dict]]:
-    pcc = None
-    scc: List[Dict] = []
     if not lines:
-        return pcc, scc
+        return None, []
+    return _parse_qcainfo_text("\n".join(lines))
 
-    for ln in lines:
-        s = ln.strip()
-        if not s.startswith("+QCAINFO"):
-            continue
-        payload = _payload_after_first_quoted_tag(s)
-        toks = _split_csv_tokens(payload)
+def _parse_qcainfo_text(text: str) -> Tuple[Dict, List[Dict]]:
+    pcc = None
+    scc: List[Dict] = []
+    for m in _QCAINFO_RE.finditer(text):
+        toks = _split_csv_tokens(m.group(1).strip())
         if not toks:
             continue
 
@@ -1071,101 +1082,81 @@ def _parse_qcainfo(lines: List[str]) -> Tuple[Dict, List[Dict]]:
 
     return pcc, scc
 
-def _parse_qeng_neighbor_lte(lines: List[str]) -> List[Dict]:
-    out: List[Dict] = []
-    if not lines:
-        return out
-    for ln in lines:
-        s = ln.strip()
-        if not s.startswith("+QENG:"):
-            continue
-        if "neighbourcell" not in s and "neighbour" not in s:
-            continue
-        payload = _payload_after_first_quoted_tag(s)
-        toks = _split_csv_tokens(payload)
-        if not toks:
-            continue
-        i = _find_token_index(toks, "LTE")
-        if i is None:
-            continue
-
-        def g(offset):
-            idx = i + offset
-            return _to_int_or_none(toks[idx]) if 0 <= idx < len(toks) else None
-
-        earfcn = g(1)
-        pci = g(2)
-        rsrq = g(3)
-        rsrp = g(4)
-
-        if rsrp is not None and rsrq is not None and abs(rsrp) < 10 and abs(rsrq) > 10:
-            rsrp, rsrq = rsrq, rsrp
-
-        if earfcn is None or pci is None:
-            continue
-
-        out.append(
-            {
-                "earfcn": earfcn,
-                "pci": pci,
-                "rsrp": rsrp,
-                "rsrq": rsrq,
-                "sinr": None,
-                "srxlev": None,
-            }
-        )
-    return out
-
-def _parse_qeng_neighbor_nr(lines: List[str]) -> List[Dict]:
-    out: List[Dict] = []
-    if not lines:
-        return out
-    for ln in lines:
-        s = ln.strip()
-        if not s.startswith("+QENG:"):
-            continue
-        if "neighbourcell" not in s and "neighbour" not in s:
-            continue
-        payload = _payload_after_first_quoted_tag(s)
-        toks = _split_csv_tokens(payload)
+def _filter_neighbour_lines(lines: List[str]) -> List[str]:
+    """
+    保留可能是邻区的 +QENG 行（原样，不 strip）；条件取两套邻区解析器的并集，
+    各解析器内部仍会做自己的精确判断
+    """
+    # 回显本来就是小写 neighbour：原样命中时不再 lower() 复制整行
+    return [
+        ln for ln in lines or ()
+        if "+QENG" in ln and ("neighbour" in ln or "neighbour" in ln.lower())
+    ]
+
+_NB_LTE_COLS = ("earfcn", "pci", "rsrp", "rsrq", "sinr", "srxlev")
+_NB_NR_COLS = ("nrarfcn", "pci", "rsrp", "rsrq", "sinr", "scs_khz")
+
+def _parse_qeng_neighbor_cols_text(text: str) -> Tuple[Dict[str, List], Dict[str, List]]:
+    """一遍扫描同时产出 (LTE 列, NR 列)：每行只切分/转大写一次，再分别按 LTE、NR 规则取值"""
+    lte: Dict[str, List] = {k: [] for k in _NB_LTE_COLS}
+    nr: Dict[str, List] = {k: [] for k in _NB_NR_COLS}
+    _int = _to_int_or_none
+    for m in _QENG_NB_RE.finditer(text):
+        toks = _split_csv_tokens(m.group(1).strip())
         if not toks:
             continue
-
-        i = _find_token_index(toks, "NR5G", "NR", "NR5G-SA", "NR5G-NSA")
+        n = len(toks)
+        up = [t.upper() for t in toks]
+
+        # --- LTE: "LTE", earfcn, pci, rsrq, rsrp ---
+        if "LTE" in up:
+            i = up.index("LTE")
+            earfcn = _int(toks[i + 1]) if i + 1 < n else None
+            pci = _int(toks[i + 2]) if i + 2 < n else None
+            rsrq = _int(toks[i + 3]) if i + 3 < n else None
+            rsrp = _int(toks[i + 4]) if i + 4 < n else None
+
+            if rsrp is not None and rsrq is not None and abs(rsrp) < 10 and abs(rsrq) > 10:
+                rsrp, rsrq = rsrq, rsrp
+
+            if earfcn is not None and pci is not None:
+                lte["earfcn"].append(earfcn)
+                lte["pci"].append(pci)
+                lte["rsrp"].append(rsrp)
+                lte["rsrq"].append(rsrq)
+                lte["sinr"].append(None)
+                lte["srxlev"].append(None)
+
+        # --- NR: "NR5G"[, scs], nrarfcn, pci, rsrp, rsrq ---
+        i = None
+        for k in ("NR5G", "NR", "NR5G-SA", "NR5G-NSA"):
+            if k in up:
+                i = up.index(k)
+                break
         if i is None:
             continue
 
         scs_khz = None
-        next_idx = i + 1
-        if next_idx < len(toks):
-            maybe_scs = _to_int_or_none(toks[next_idx])
+        if i + 1 < n:
+            maybe_scs = _int(toks[i + 1])
             if maybe_scs in (15, 30, 60, 120):
                 scs_khz = maybe_scs
-                i = next_idx
-
-        def g(offset):
-            idx = i + 1 + offset
-            return _to_int_or_none(toks[idx]) if 0 <= idx < len(toks) else None
+                i += 1
 
-        nrarfcn = g(0)
-        pci = g(1)
-        rsrp = g(2)
-        rsrq = g(3)
+        nrarfcn = _int(toks[i + 1]) if i + 1 < n else None
+        pci = _int(toks[i + 2]) if i + 2 < n else None
+        rsrp = _int(toks[i + 3]) if i + 3 < n else None
+        rsrq = _int(toks[i + 4]) if i + 4 < n else None
 
         if nrarfcn is None or pci is None:
             continue
 
-        out.append(
-            {
-                "nrarfcn": nrarfcn,
-                "pci": pci,
-                "rsrp": rsrp,
-                "rsrq": rsrq,
-                "sinr": None,
-                "srxlev": None,
-                "scs_khz": scs_khz,
-            }
-        )
-    return out
+        nr["nrarfcn"].append(nrarfcn)
+        nr["pci"].append(pci)
+        nr["rsrp"].append(rsrp)
+        nr["rsrq"].append(rsrq)
+        nr["sinr"].append(None)
+        nr["scs_khz"].append(scs_khz)
+    return lte, nr
 
 # ===== /Step6 parsers =====
@@ -1,10 +1,15 @@
 # routes/net.py
+import ctypes
 import logging
+import re
+import select
+import signal
 import subprocess
+import threading
 import time
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from fastapi import APIRouter, HTTPException
-from .schemas import UplinkRequest, UplinkResponse
+from .schemas import UplinkRequest, UplinkResponse, _ms_now
 
 router = APIRouter(prefix="/net", tags=["net"])
 logger = logging.getLogger(__name__)
@@ -12,6 +17,165 @@ logger = logging.getLogger(__name__)
 # 脚本路径
 UPLINK_SCRIPT = "/usr/local/sbin/ls-uplink"
 
+# default 路由缓存：mode 和 default_route 共用一次 ip route，轮询时不再每次 fork
+# 后台常驻 `ip -o monitor route`（随 app 启停，见 start/stop_route_monitor），
+# 有 default 路由事件就作废缓存；monitor 未运行时退回 1 秒 TTL
+_ROUTE_CACHE_TTL = 1.0  # 秒
+# monitor 在线时也留一个长 TTL 兜底，万一漏掉事件最多过这么久就会重读
+_ROUTE_CACHE_MONITORED_TTL = 30.0  # 秒
+_ROUTE_CACHE = {"ts": 0.0, "lines": None, "lines_gen": -1, "gen": 0, "monitored": False}
+_ROUTE_LOCK = threading.Lock()        # 只保护缓存读写，ip route 在锁外执行
+_ROUTE_GEN_LOCK = threading.Lock()    # 只保护 gen 自增，monitor 线程不必等 ip route
+_ROUTE_MONITOR_BACKOFF_MAX = 60.0     # monitor 进程退出后的最大重启间隔（秒）
+# ip monitor 订阅成功时不输出任何东西：先读到输出，或进程存活满这么久，才认为已订阅
+_ROUTE_MONITOR_READY_WAIT = 0.5       # 秒
+_ROUTE_MONITOR_STOP_WAIT = 2.0        # shutdown 时等 ip 退出的时间（秒），超时就 kill
+_ROUTE_MONITOR_LOCK = threading.Lock()  # 保护 monitor 线程/进程句柄，与 stop 互斥
+_ROUTE_MONITOR_STOP = threading.Event()
+_route_monitor_thread: Optional[threading.Thread] = None
+_route_monitor_proc: Optional[subprocess.Popen] = None
+
+# PR_SET_PDEATHSIG：父进程没走到 shutdown 就退出（崩溃、被 kill）时 ip 也收到 SIGTERM
+# 在父进程里先解析好 prctl，fork 后的子进程里只做一次调用
+_PR_SET_PDEATHSIG = 1
+try:
+    _prctl = ctypes.CDLL(None, use_errno=True).prctl
+except (OSError, AttributeError):  # 非 Linux
+    _prctl = None
+
+
+def _die_with_parent() -> None:
+    """Popen 的 preexec_fn：让 ip 随父进程一起结束"""
+    _prctl(_PR_SET_PDEATHSIG, signal.SIGTERM)
+
+
+def _route_monitor_loop() -> None:
+    """常驻读取 ip monitor 输出；进程挂掉按指数退避重启，stop_route_monitor 后退出"""
+    global _route_monitor_proc
+    backoff = 1.0
+    while not _ROUTE_MONITOR_STOP.is_set():
+        started = time.monotonic()
+        proc = None
+        with _ROUTE_MONITOR_LOCK:
+            if _ROUTE_MONITOR_STOP.is_set():
+                break
+            try:
+                proc = subprocess.Popen(
+                    ["ip", "-o", "monitor", "route"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1,
+                    preexec_fn=_die_with_parent if _prctl is not None else None,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to start ip monitor route: {e}")
+            _route_monitor_proc = proc
+        if proc is not None:
+            try:
+                # 等订阅生效后再信任事件，并作废一次缓存：订阅前的路由变化收不到事件
+                select.select([proc.stdout], [], [], _ROUTE_MONITOR_READY_WAIT)
+                if proc.poll() is None:
+                    _ROUTE_CACHE["monitored"] = True
+                _invalidate_route_cache()
+                for line in proc.stdout:
+                    if "default" in line:
+                        _invalidate_route_cache()
+            finally:
+                _ROUTE_CACHE["monitored"] = False
+                _invalidate_route_cache()
+                proc.wait()
+                with _ROUTE_MONITOR_LOCK:
+                    _route_monitor_proc = None
+            if _ROUTE_MONITOR_STOP.is_set():
+                break
+            logger.warning(f"ip monitor route exited with code {proc.returncode}")
+        if time.monotonic() - started > _ROUTE_MONITOR_BACKOFF_MAX:
+            backoff = 1.0
+        if _ROUTE_MONITOR_STOP.wait(backoff):
+            break
+        backoff = min(backoff * 2, _ROUTE_MONITOR_BACKOFF_MAX)
+
+
+def start_route_monitor() -> None:
+    """app 启动时调用：拉起 monitor 线程（已在运行则不重复启动）"""
+    global _route_monitor_thread
+    with _ROUTE_MONITOR_LOCK:
+        if _route_monitor_thread is not None and _route_monitor_thread.is_alive():
+            return
+        _ROUTE_MONITOR_STOP.clear()
+        _route_monitor_thread = threading.Thread(
+            target=_route_monitor_loop, name="ip-monitor-route", daemon=True
+        )
+        _route_monitor_thread.start()
+
+
+def stop_route_monitor() -> None:
+    """app 关闭时调用：结束 ip monitor 子进程并等 monitor 线程退出"""
+    global _route_monitor_thread
+    with _ROUTE_MONITOR_LOCK:
+        _ROUTE_MONITOR_STOP.set()
+        proc = _route_monitor_proc
+        thread = _route_monitor_thread
+        _route_monitor_thread = None
+    if proc is not None and proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=_ROUTE_MONITOR_STOP_WAIT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    if thread is not None:
+        thread.join(timeout=_ROUTE_MONITOR_STOP_WAIT)
+
+
+def _default_route_lines() -> List[str]:
+    """
+    返回 ip route 中所有 default 行
+    monitor 在线时复用到下一次路由事件（最长 30 秒）；否则 1 秒内复用上次结果
+    ip 执行失败时原样抛出 subprocess 异常，且不缓存
+    """
+    with _ROUTE_LOCK:
+        now = time.monotonic()
+        gen = _ROUTE_CACHE["gen"]
+        if (
+            _ROUTE_CACHE["lines"] is not None
+            and _ROUTE_CACHE["lines_gen"] == gen
+            and now - _ROUTE_CACHE["ts"] < (
+                _ROUTE_CACHE_MONITORED_TTL if _ROUTE_CACHE["monitored"] else _ROUTE_CACHE_TTL
+            )
+        ):
+            return _ROUTE_CACHE["lines"]
+    # 不持锁跑 ip route：一次慢读取（最长 5 秒）不会把其它请求一起卡住
+    result = subprocess.run(
+        ["ip", "route"],
+        capture_output=True,
+        text=True,
+        timeout=5,
+        check=True
+    )
+    lines = [line for line in result.stdout.strip().split("\n") if line.startswith("default")]
+    with _ROUTE_LOCK:
+        # 记录读取前的 gen：读取期间来了事件，下次就会重新读；
+        # 并发读取时不让基于旧 gen 的结果覆盖新的
+        if gen >= _ROUTE_CACHE["lines_gen"]:
+            _ROUTE_CACHE["ts"] = now
+            _ROUTE_CACHE["lines"] = lines
+            _ROUTE_CACHE["lines_gen"] = gen
+    return lines
+
+
+def _invalidate_route_cache() -> None:
+    """路由已变（monitor 事件或切换出口），作废缓存"""
+    with _ROUTE_GEN_LOCK:
+        _ROUTE_CACHE["gen"] += 1
+
+
+# default 路由行：取 dev 与（可选的）metric，均按空白分隔的独立 token 匹配
+_DEFAULT_ROUTE_RE = re.compile(
+    r"^default\b.*?(?<!\S)dev\s+(?P<dev>\S+)(?:.*?(?<!\S)metric\s+(?P<metric>\d+)(?!\S))?"
+)
+
 
 def _get_current_uplink_mode() -> Optional[Literal["sim", "wifi"]]:
     """
@@ -19,34 +183,14 @@ def _get_current_uplink_mode() -> Optional[Literal["sim", "wifi"]]:
     返回 "sim" (usb0) 或 "wifi" (wlan0) 或 None
     """
     try:
-        result = subprocess.run(
-            ["ip", "route"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            check=True
-        )
-        lines = result.stdout.strip().split("\n")
-        
         # 查找 metric 最小的 default 路由
         default_routes = []
-        for line in lines:
-            if line.startswith("default"):
-                parts = line.split()
-                # 提取 dev 和 metric
-                dev = None
-                metric = 9999
-                for i, part in enumerate(parts):
-                    if part == "dev" and i + 1 < len(parts):
-                        dev = parts[i + 1]
-                    elif part == "metric" and i + 1 < len(parts):
-                        try:
-                            metric = int(parts[i + 1])
-                        except ValueError:
-                            pass
-                
-                if dev:
-                    default_routes.append((metric, dev, line))
+        for line in _default_route_lines():
+            # 提取 dev 和 metric（无 metric 视为 9999）
+            m = _DEFAULT_ROUTE_RE.match(line)
+            if m:
+                metric = int(m["metric"]) if m["metric"] else 9999
+                default_routes.append((metric, m["dev"], line))
         
         if not default_routes:
             return None
@@ -77,15 +221,7 @@ def _get_current_uplink_mode() -> Optional[Literal["sim", "wifi"]]:
 def _get_default_route_string() -> Optional[str]:
     """获取当前默认路由的字符串表示"""
     try:
-        result = subprocess.run(
-            ["ip", "route"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            check=True
-        )
-        lines = result.stdout.strip().split("\n")
-        default_lines = [line for line in lines if line.startswith("default")]
+        default_lines = _default_route_lines()
         return "\n".join(default_lines) if default_lines else None
     except Exception as e:
         logger.error(f"Failed to get default route: {e}")
@@ -98,14 +234,14 @@ def get_uplink():
     查询当前上网出口模式
     通过 ip route 判断默认路由的网卡（usb0=sim, wlan0=wifi）
     """
-    ts = int(time.time() * 1000)
+    ts = _ms_now()
     
     try:
         mode = _get_current_uplink_mode()
         default_route = _get_default_route_string()
         
         if mode is None:
-            return UplinkResponse(
+            return UplinkResponse.build_trusted(
                 ok=False,
                 ts=ts,
                 error="无法确定当前上网出口模式",
@@ -113,7 +249,7 @@ def get_uplink():
                 default_route=default_route
             )
         
-        return UplinkResponse(
+        return UplinkResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None,
@@ -122,7 +258,7 @@ def get_uplink():
         )
     except Exception as e:
         logger.error(f"Unexpected error in get_uplink: {e}")
-        return UplinkResponse(
+        return UplinkResponse.build_trusted(
             ok=False,
             ts=ts,
             error=f"查询失败: {str(e)}",
@@ -138,7 +274,7 @@ def set_uplink(req: UplinkRequest):
     内部执行: sudo /usr/local/sbin/ls-uplink <mode>
     只接受 sim/wifi 两种模式（已在 Pydantic 模型中限制）
     """
-    ts = int(time.time() * 1000)
+    ts = _ms_now()
     
     # 安全验证：确保 mode 只能是 sim 或 wifi（Pydantic 已保证，但双重检查）
     if req.mode not in ("sim", "wifi"):
@@ -169,7 +305,7 @@ def set_uplink(req: UplinkRequest):
                 error_msg = f"Wi-Fi 连接未找到: {error_msg}"
             
             logger.error(f"ls-uplink failed: {error_msg}")
-            return UplinkResponse(
+            return UplinkResponse.build_trusted(
                 ok=False,
                 ts=ts,
                 error=error_msg,
@@ -177,26 +313,23 @@ def set_uplink(req: UplinkRequest):
                 default_route=None
             )
         
-        # 脚本执行成功，获取当前状态
-        mode = _get_current_uplink_mode()
+        # 脚本执行成功：出口就是请求的模式，不再为确认 mode 去跑 ip route
+        # default_route 作废缓存后同步读一次，返回切换后的新路由
+        _invalidate_route_cache()
         default_route = _get_default_route_string()
         
-        # 如果无法确定模式，使用请求的模式（脚本已执行成功）
-        if mode is None:
-            mode = req.mode
-        
-        return UplinkResponse(
+        return UplinkResponse.build_trusted(
             ok=True,
             ts=ts,
             error=None,
-            mode=mode,
+            mode=req.mode,
             default_route=default_route
         )
         
     except subprocess.TimeoutExpired:
         error_msg = "脚本执行超时（超过30秒）"
         logger.error(error_msg)
-        return UplinkResponse(
+        return UplinkResponse.build_trusted(
             ok=False,
             ts=ts,
             error=error_msg,
@@ -206,7 +339,7 @@ def set_uplink(req: UplinkRequest):
     except FileNotFoundError:
         error_msg = f"脚本不存在: {UPLINK_SCRIPT}，请确保已正确安装"
         logger.error(error_msg)
-        return UplinkResponse(
+        return UplinkResponse.build_trusted(
             ok=False,
             ts=ts,
             error=error_msg,
@@ -216,7 +349,7 @@ def set_uplink(req: UplinkRequest):
     except PermissionError:
         error_msg = "权限不足，无法执行脚本。请检查 sudoers 配置"
         logger.error(error_msg)
-        return UplinkResponse(
+        return UplinkResponse.build_trusted(
             ok=False,
             ts=ts,
             error=error_msg,
@@ -226,7 +359,7 @@ def set_uplink(req: UplinkRequest):
     except Exception as e:
         error_msg = f"切换失败: {str(e)}"
         logger.error(f"Unexpected error in set_uplink: {e}")
-        return UplinkResponse(
+        return UplinkResponse.build_trusted(
             ok=False,
             ts=ts,
             error=error_msg,
@@ -1,8 +1,10 @@
+from functools import lru_cache
+import re
 from typing import Any, Dict, Optional
-from urllib.parse import urlparse, urlunparse
+from urllib.parse import quote, urlparse, urlunparse
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Query, Header
-from fastapi.responses import StreamingResponse, Response
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 import requests
 
 import config
@@ -10,11 +12,33 @@ from nvr_client import NvrClient
 
 router = APIRouter(prefix="/nvr", tags=["nvr"])
 
+# rtsp(s)://<netloc> ；netloc 到第一个 / ? # 为止（与 urlparse 一致）
+_RTSP_NETLOC_RE = re.compile(r"^(rtsps?://)([^/?#]*)", re.I)
+
+# 录像文件转发的分块大小
+_FILE_CHUNK_SIZE = 64 * 1024
+
+# 录像文件需要透传给客户端的上游响应头（Content-Range 仅 Range 请求时会有）
+_FORWARD_HEADERS = (
+    "Content-Type",
+    "Content-Length",
+    "Content-Range",
+    "Accept-Ranges",
+    "ETag",
+    "Last-Modified",
+)
+
+
+@lru_cache(maxsize=1)
+def _nvr_singleton() -> NvrClient:
+    # 进程内共用一个客户端（及其连接池），避免每个请求重新握手
+    return NvrClient()
+
 
 def get_client() -> NvrClient:
     if not config.NVR_ENABLED:
         raise HTTPException(status_code=503, detail="NVR integration disabled")
-    return NvrClient()
+    return _nvr_singleton()
 
 
 def _rewrite_stream_urls_for_public(data: dict, ip: str) -> dict:
@@ -42,6 +66,12 @@ def _rewrite_stream_urls_for_public(data: dict, ip: str) -> dict:
     public_host = config.NVR_PUBLIC_HOST
 
     def _rewrite_one(original: str) -> str:
+        # 常见的 rtsp:// 地址直接用正则替换 netloc，不走 urlparse/urlunparse
+        m = _RTSP_NETLOC_RE.match(original)
+        if m:
+            netloc = m.group(2)
+            userinfo = netloc.split("@", 1)[0] + "@" if "@" in netloc else ""
+            return f"{m.group(1).lower()}{userinfo}{public_host}:{external_port}{original[m.end():]}"
         parsed = urlparse(original)
         # netloc 里可能有 user:pass@
         host_port = parsed.netloc
@@ -66,6 +96,34 @@ def _rewrite_stream_urls_for_public(data: dict, ip: str) -> dict:
     return data
 
 
+_URL_SCHEME_NETLOC_RE = re.compile(r"^(?:[A-Za-z][A-Za-z0-9+.-]*:)?//[^/]*")
+
+
+def _url_last_segment(url: str) -> str:
+    """
+    取 URL 路径的最后一段（去掉 query/fragment/;params 与首尾 /），
+    对 http(s)/rtsp 这类带 scheme://netloc 的 URL 与
+    urlparse(url).path.strip("/").split("/")[-1] 等价，但不分配六元组；
+    不做 urlparse 的首尾空白/控制字符清理，纯 "x:" 这类只有 scheme 的串也不保证一致
+    """
+    url = url.split("#", 1)[0].split("?", 1)[0]
+    m = _URL_SCHEME_NETLOC_RE.match(url)
+    if m:
+        url = url[m.end():]
+    semi = url.find(";", max(url.rfind("/"), 0))
+    if semi != -1:
+        url = url[:semi]
+    return url.strip("/").rpartition("/")[2]
+
+
+def _json(data: Any) -> JSONResponse:
+    """
+    NVR 返回的已经是纯 JSON 数据：直接渲染，跳过 FastAPI 按返回注解做的
+    校验 + jsonable_encoder 整树遍历（cameras/segments 列表很长时开销明显）
+    """
+    return JSONResponse(content=data)
+
+
 @router.get("/health")
 def nvr_health(client: NvrClient = Depends(get_client)) -> Dict[str, Any]:
     """
@@ -73,11 +131,11 @@ def nvr_health(client: NvrClient = Depends(get_client)) -> Dict[str, Any]:
     """
     try:
         data = client.health()
-        return {
+        return _json({
             "ok": True,
             "ts": data.get("ts"),
             "nvr": data,
-        }
+        })
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=502, detail=f"NVR health failed: {exc}") from exc
 
@@ -131,7 +189,7 @@ def nvr_cameras(client: NvrClient = Depends(get_client)) -> Dict[str, Any]:
         # 直接透传 NVR 的完整响应，不进行任何解析、过滤或转换
         # 不管 NVR 返回的是 List 还是 Map，都原样转发
         data = client.list_cameras()
-        return data
+        return _json(data)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=502, detail=f"NVR cameras failed: {exc}") from exc
 
@@ -148,7 +206,7 @@ def nvr_camera_stream(
     try:
         data = client.stream(ip)
         data = _rewrite_stream_urls_for_public(data, ip)
-        return data
+        return _json(data)
     except Exception as exc:  # noqa: BLE001
         # 保持和其他 NVR 路由一样的错误风格
         raise HTTPException(
@@ -223,7 +281,7 @@ def nvr_camera_live_hls(
                 if "auth_status" in camera:
                     camera["auth_status"] = "ok"
         
-        return data
+        return _json(data)
     except HTTPException:
         raise
     except Exception as exc:  # noqa: BLE001
@@ -249,7 +307,7 @@ def nvr_recordings_list(
         #   "cameras": [...],
         #   "error": null
         # }
-        return data
+        return _json(data)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(
             status_code=502,
@@ -267,7 +325,7 @@ def nvr_recordings_days(
     """
     try:
         data = client.recordings_days(ip)
-        return data
+        return _json(data)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(
             status_code=502,
@@ -299,10 +357,11 @@ def nvr_recordings_segments(
         else:
             gen2_base = f"{scheme}://{host}"
         
-        # 重写 segments 中的 url 字段
+        # 重写 segments 中的 url 字段（一天可能上千个片段，前缀只拼一次）
         if isinstance(data, dict) and "segments" in data:
             segments = data["segments"]
             if isinstance(segments, list):
+                prefix = f"{gen2_base}/v1/nvr/recordings/{ip}/files/{date}/"
                 for segment in segments:
                     if isinstance(segment, dict) and "url" in segment:
                         # 保存原始 URL（调试用）
@@ -311,24 +370,14 @@ def nvr_recordings_segments(
                             segment["origin_url"] = original_url
                         
                         # 重写为 Gen2 地址
-                        # 从原始 URL 中提取 filename（如果可能）
-                        # 或者从 segment 的其他字段中获取
+                        # 优先用 segment 的 filename 字段，否则从原始 URL 的路径末段提取
                         filename = segment.get("filename")
                         if filename:
-                            segment["url"] = f"{gen2_base}/v1/nvr/recordings/{ip}/files/{date}/{filename}"
-                        elif original_url:
-                            # 如果原始 URL 是完整路径，尝试提取文件名
-                            try:
-                                parsed = urlparse(original_url)
-                                path_parts = parsed.path.strip("/").split("/")
-                                if path_parts:
-                                    filename = path_parts[-1]
-                                    segment["url"] = f"{gen2_base}/v1/nvr/recordings/{ip}/files/{date}/{filename}"
-                            except Exception:
-                                # 解析失败，保持原样或使用原始 URL
-                                pass
+                            segment["url"] = prefix + filename
+                        elif original_url and isinstance(original_url, str):
+                            segment["url"] = prefix + _url_last_segment(original_url)
         
-        return data
+        return _json(data)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(
             status_code=502,
@@ -345,12 +394,21 @@ def nvr_recordings_file(
     range_header: Optional[str] = Header(None, alias="Range"),
     if_range_header: Optional[str] = Header(None, alias="If-Range"),
     client: NvrClient = Depends(get_client),
-) -> StreamingResponse:
+) -> Response:
     """
     代理 NVR 录像文件，流式传输给客户端
     
     支持 Range 请求（断点续传），透传请求头和响应头
     """
+    if config.NVR_USE_XACCEL:
+        # 交给 nginx 内部 location 转发（sendfile/零拷贝），Range/If-Range 由 nginx 透传；
+        # 不带 Content-Type，由 nginx 沿用上游 NVR 返回的类型
+        return Response(
+            headers={
+                "X-Accel-Redirect": f"{config.NVR_XACCEL_PREFIX}/{quote(ip)}/files/{quote(date)}/{quote(filename)}",
+            },
+        )
+
     try:
         # 构建要透传的请求头
         headers = {}
@@ -373,33 +431,20 @@ def nvr_recordings_file(
         ) from exc
 
     # 流式转发内容（不要一次性读入内存）
+    # 64KB 一块，比 8KB 少 8 倍的循环/系统调用；客户端中途断开也要释放上游连接
     def iter_content():
-        for chunk in resp.iter_content(chunk_size=8192):
-            if chunk:
-                yield chunk
-
-    # 构建响应头（透传关键响应头）
-    response_headers = {}
-    
-    # 透传 Content-Type
-    if "Content-Type" in resp.headers:
-        response_headers["Content-Type"] = resp.headers["Content-Type"]
-    
-    # 透传 Content-Length（如果存在）
-    if "Content-Length" in resp.headers:
-        response_headers["Content-Length"] = resp.headers["Content-Length"]
-    
-    # 透传 Content-Range（Range 请求时会有）
-    if "Content-Range" in resp.headers:
-        response_headers["Content-Range"] = resp.headers["Content-Range"]
-    
-    # 透传 Accept-Ranges
-    if "Accept-Ranges" in resp.headers:
-        response_headers["Accept-Ranges"] = resp.headers["Accept-Ranges"]
-    
-    # 透传 ETag（如果存在）
-    if "ETag" in resp.headers:
-        response_headers["ETag"] = resp.headers["ETag"]
+        try:
+            for chunk in resp.iter_content(chunk_size=_FILE_CHUNK_SIZE):
+                if chunk:
+                    yield chunk
+        finally:
+            resp.close()
+
+    # 构建响应头（透传关键响应头，缺失的不带）
+    upstream_headers = resp.headers
+    response_headers = {
+        k: v for k in _FORWARD_HEADERS if (v := upstream_headers.get(k)) is not None
+    }
     
     # 获取状态码（原样返回 206/200）
     status_code = resp.status_code
@@ -1,12 +1,104 @@
 from __future__ import annotations
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, List, Any, Literal
+from pydantic.fields import FieldInfo
+from typing import Optional, Dict, List, Any, Literal, Annotated, Union, Tuple, get_args
+from typing_extensions import TypedDict
 import time
 
 from pydantic.config import ConfigDict
 
+import config
 
-class InfoModel(BaseModel):
+
+class _FastBase(BaseModel):
+    """
+    本模块所有模型的公共基类：统一配置，生成的 core schema 更小；
+    defer_build 推迟到首次使用才构建校验器（没用到的模型不占内存）。
+    live 会边解析边给响应对象补字段，所以不设 frozen
+    """
+    model_config = ConfigDict(
+        extra="ignore",
+        validate_assignment=False,
+        arbitrary_types_allowed=False,
+        defer_build=True,
+    )
+
+
+_time_ns = time.time_ns
+
+def _ms_now() -> int:
+    """毫秒时间戳：time_ns 整数除，不经过 float（各响应模型 ts 的默认值）"""
+    return _time_ns() // 1_000_000
+
+
+# 受约束的字符串字段各自只定义一次，所有模型共用同一个别名（同一份 pattern 校验）
+HexStr = Annotated[str, Field(pattern=r"^[0-9A-Fa-f]+$")]      # TAC / ECI / NCI 十六进制
+MccMncStr = Annotated[str, Field(pattern=r"^\d{2,3}$")]        # MCC / MNC
+# mode_pref 会直接拼进 AT 指令：只放行 AUTO 或制式的冒号组合（如 LTE:NR5G）
+ModePrefStr = Annotated[str, Field(pattern=r"^(?i:AUTO|(?:WCDMA|LTE|NR5G)(?::(?:WCDMA|LTE|NR5G))*)$")]
+
+
+# verbose 原始回显：AT 命令 -> 回显行。行用 tuple 直接复用串口层的结果，不再逐条复制成 list；
+# JSON 形状不变（仍是 {"AT+XXX": ["...", "OK"]}）
+# 行保持 str：解析器本来就要按 str 扫一遍，串口层整段只 decode 一次，raw 直接共享同一批对象
+RawLog = Dict[str, Tuple[str, ...]]
+
+
+# 响应模型的数据全部由服务端自己产生（AT 解析结果 / 已构造好的模型），视为可信：
+# build_trusted 直接 model_construct 跳过校验。置 False 可退回完整校验便于排查
+TRUSTED = True
+
+
+def _nested_model_type(field: Optional[FieldInfo]) -> Optional[type]:
+    """字段注解为 Model 或 Optional[Model] 时返回该 BaseModel 子类；
+    其它（含 Union[Model, TypedDict] 这类允许直接放 dict 的字段）返回 None"""
+    if field is None:
+        return None
+    ann = field.annotation
+    if isinstance(ann, type) and issubclass(ann, BaseModel):
+        return ann
+    args = [t for t in get_args(ann) if t is not type(None)]
+    if len(args) == 1 and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+        return args[0]
+    return None
+
+
+def _fast_construct_nested(cls: type, data: Dict[str, Any]) -> BaseModel:
+    """model_construct，且以 dict 传入的子模型字段也递归构造；已是模型实例的原样使用"""
+    if not cls.__pydantic_complete__:
+        # 前向引用（如 LiveResponse.session）要 rebuild 后字段注解才是真实类型
+        cls.model_rebuild()
+    fields = cls.model_fields
+    values = {}
+    for name, v in data.items():
+        if isinstance(v, dict):
+            sub = _nested_model_type(fields.get(name))
+            if sub is not None:
+                v = _fast_construct_nested(sub, v)
+        values[name] = v
+    return cls.model_construct(**values)
+
+
+class TrustedResponse(_FastBase):
+    """服务端构造的响应基类：路由里用 build_trusted 代替直接实例化"""
+
+    @classmethod
+    def build_trusted(cls, **kwargs: Any):
+        if not TRUSTED:
+            return cls.model_validate(kwargs)
+        return _fast_construct_nested(cls, kwargs)
+
+    def json_response(self) -> Response:
+        """
+        由 pydantic-core 一次序列化成 JSON bytes，不经 jsonable_encoder。
+        用它返回的路由不要再写 response_model=（FastAPI 会对返回值再校验一遍），
+        文档改用 responses={200: {"model": ...}} 标注
+        """
+        return Response(content=self.__pydantic_serializer__.to_json(self), media_type="application/json")
+
+
+class InfoModel(_FastBase):
     manufacturer: Optional[str] = Field(
         None, description="厂商名（AT+GMI）示例：'Quectel'"
     )
@@ -21,7 +113,7 @@ class InfoModel(BaseModel):
     )
 
 
-class SimModel(BaseModel):
+class SimModel(_FastBase):
     imsi: Optional[str] = Field(None, description="IMSI（AT+CIMI）")
     iccid: Optional[str] = Field(None, description="ICCID（AT+ICCID）")
     msisdn: Optional[str] = Field(
@@ -35,70 +127,89 @@ class SimModel(BaseModel):
     )
 
 
-class UsbSpeedModel(BaseModel):
+# usbspeed 代码 -> 说明；只有三种取值，模块级查表，每次响应不再拼字符串
+_USB_LABELS: Dict[int, str] = {
+    20: "USB 2.0 high speed, 480 Mbps",
+    311: "USB 3.1 Gen1, 5 Gbps",
+    312: "USB 3.1 Gen2, 10 Gbps",
+}
+
+
+class UsbSpeedModel(_FastBase):
     code: Optional[int] = Field(
         None,
         description='USB 模式代码 [AT+QCFG="usbspeed"]：20=USB 2.0 (480Mbps), 311=USB 3.1 Gen1 (5Gbps), 312=USB 3.1 Gen2 (10Gbps)',
     )
     label: Optional[str] = Field(None, description="人类可读说明")
 
+    @classmethod
+    def from_code(cls, code: Optional[int]) -> "UsbSpeedModel":
+        return cls.model_construct(code=code, label=_USB_LABELS.get(code))
+
 
-class ModemModel(BaseModel):
+class ModemModel(_FastBase):
     usb: Optional[UsbSpeedModel] = Field(
         None, description='USB速率模式（AT+QCFG="usbspeed"）'
     )
 
 
-class InfoResponse(BaseModel):
+class InfoResponse(TrustedResponse):
+    """/info 响应；路由用 json_response() 直接序列化，不要加 response_model="""
     ok: bool = Field(True, description="调用是否成功")
-    ts: int = Field(..., description="毫秒级时间戳")
+    ts: int = Field(default_factory=_ms_now, description="毫秒级时间戳")
     error: Optional[str] = Field(None, description="错误信息（成功时为 None）")
     info: InfoModel = Field(default_factory=InfoModel)
     sim: SimModel = Field(default_factory=SimModel)
     modem: ModemModel = Field(default_factory=ModemModel)
-    raw: Optional[Dict[str, List[str]]] = Field(
+    raw: Optional[RawLog] = Field(
         None, description="仅在 ?verbose=1 时返回：AT 原始回显"
     )
 
 # routes/schemas.py  —— 仅 live 模块所需模型（Pydantic v2）
 
-class LiveRegModel(BaseModel):
+class LiveRegModel(_FastBase):
     cs: Optional[str] = Field(None, description="电路域注册状态(保留)")
     ps: Optional[str] = Field(None, description="分组域注册状态")
 
-class LiveModeModel(BaseModel):
+class LiveModeModel(_FastBase):
     rat: Optional[str] = Field(None, description="接入制式: SA/LTE/NSA/…")
     duplex: Optional[str] = Field(None, description="TDD/FDD")
 
-class LiveOperatorModel(BaseModel):
+class LiveOperatorModel(_FastBase):
     name: Optional[str] = Field(None, description="运营商标识(如 46000)")
-    mcc: Optional[str] = Field(None, description="MCC 字符串")
-    mnc: Optional[str] = Field(None, description="MNC 字符串")
-
-class LiveSignalModel(BaseModel):
-    rsrp: Optional[int] = None
-    rsrq: Optional[int] = None
-    rssi: Optional[int] = None
-    sinr: Optional[int] = None
+    mcc: Optional[MccMncStr] = Field(None, description="MCC 字符串")
+    mnc: Optional[MccMncStr] = Field(None, description="MNC 字符串")
+
+# signal / signal_lte / signal_nr 共用一个模型：signal 填 int，signal_lte/nr 沿用字符串
+class SignalBlock(_FastBase):
+    rssi: Optional[Union[int, str]] = None
+    rsrp: Optional[Union[int, str]] = None
+    rsrq: Optional[Union[int, str]] = None
+    sinr: Optional[Union[int, str]] = None
     cqi: Optional[int] = None
-
-class SignalBlock(BaseModel):
-    rssi: Optional[str] = None
-    rsrp: Optional[str] = None
-    rsrq: Optional[str] = None
-    sinr: Optional[str] = None
     quality: Optional[str] = None   # excellent/good/fair/poor
     note: Optional[str] = None      # 可选备注
 
-class ServingSA(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+LiveSignalModel = SignalBlock  # 旧名保留
+
+# 输出专用的 dict 形态：路由直接拼 dict，省掉逐个构造模型（字段与 SignalBlock 相同）
+class SignalBlockTD(TypedDict, total=False):
+    rssi: Optional[Union[int, str]]
+    rsrp: Optional[Union[int, str]]
+    rsrq: Optional[Union[int, str]]
+    sinr: Optional[Union[int, str]]
+    cqi: Optional[int]
+    quality: Optional[str]
+    note: Optional[str]
+
+class ServingSA(_FastBase):
     state: Optional[str] = None
     duplex: Optional[str] = None
-    mcc: Optional[str] = None
-    mnc: Optional[str] = None
+    mcc: Optional[MccMncStr] = None
+    mnc: Optional[MccMncStr] = None
     cellid: Optional[int] = None               # 5G 36-bit CellID -> int
     pcid: Optional[int] = None
-    tac: Optional[str] = None                  # 你现场 schema 期望是 str
+    tac: Optional[HexStr] = None               # 你现场 schema 期望是 str
     nrarfcn: Optional[int] = None
     band: Optional[str] = None                 # "NR5G BAND 41"
     dl_bw_mhz: Optional[int] = None
@@ -108,42 +219,39 @@ class ServingSA(BaseModel):
     scs_khz: Optional[int] = None
     srxlev: Optional[int] = None
 
-class ServingLTE(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+class ServingLTE(_FastBase):
     # 预留，暂为空
     pass
 
-class ServingNSA_NRPart(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+class ServingNSA_NRPart(_FastBase):
     # 预留，暂为空
     pass
 
-class ServingNSA(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+class ServingNSA(_FastBase):
     # 预留，暂为空
     pass
 
-class RegStatus(BaseModel):
+class RegStatus(_FastBase):
     eps: Optional[int] = None       # from +CEREG? stat
     nr5g: Optional[int] = None      # from +C5GREG? stat
     eps_text: Optional[str] = None  # 1=registered... 人类可读
     nr5g_text: Optional[str] = None
 
-class CellIdNorm(BaseModel):
+class CellIdNorm(_FastBase):
     # 输入可来自 QENG/CEREG/C5GREG 混合；全部可选
-    tac_hex: Optional[str] = None
+    tac_hex: Optional[HexStr] = None
     tac_dec: Optional[int] = None
-    eci_hex: Optional[str] = None       # LTE E-UTRAN Cell Identity（常见28位）
+    eci_hex: Optional[HexStr] = None    # LTE E-UTRAN Cell Identity（常见28位）
     eci_dec: Optional[int] = None
     enb_id: Optional[int] = None        # eNB/gNB 拆分后的基站ID（LTE）
     cell_id: Optional[int] = None       # 小区内Cell ID（LTE）
-    nci_hex: Optional[str] = None       # NR Cell Identity（常见36位）
+    nci_hex: Optional[HexStr] = None    # NR Cell Identity（常见36位）
     nci_dec: Optional[int] = None
     gnb_id: Optional[int] = None        # gNB 基站ID（NR）
     nci_cell_id: Optional[int] = None   # NR小区ID
     rat: Optional[str] = None           # "LTE" / "NR5G-NSA" / "NR5G-SA" …
 
-class LiveServingModel(BaseModel):
+class LiveServingModel(_FastBase):
     rat: Optional[str] = None
     sa: Optional[ServingSA] = None
     lte: Optional[ServingLTE] = None
@@ -155,8 +263,65 @@ class LiveServingModel(BaseModel):
     # 规范化后的ID放这里
     id: Optional[CellIdNorm] = None
 
+class LiveServingFlat(_FastBase):
+    """
+    LiveServingModel 的扁平形式（/live?shape=flat）：sa / id 子模型展开成 sa_* / id_* 前缀标量，
+    序列化只有一层。lte / nsa / nsa_nr 目前是无字段的占位模型，扁平形式不带
+    """
+    rat: Optional[str] = None
+    band: Optional[str] = None
+    arfcn: Optional[str] = None
+    pci: Optional[str] = None
+    # ServingSA
+    sa_state: Optional[str] = None
+    sa_duplex: Optional[str] = None
+    sa_mcc: Optional[MccMncStr] = None
+    sa_mnc: Optional[MccMncStr] = None
+    sa_cellid: Optional[int] = None
+    sa_pcid: Optional[int] = None
+    sa_tac: Optional[HexStr] = None
+    sa_nrarfcn: Optional[int] = None
+    sa_band: Optional[str] = None
+    sa_dl_bw_mhz: Optional[int] = None
+    sa_rsrp: Optional[int] = None
+    sa_rsrq: Optional[int] = None
+    sa_sinr: Optional[int] = None
+    sa_scs_khz: Optional[int] = None
+    sa_srxlev: Optional[int] = None
+    # CellIdNorm
+    id_tac_hex: Optional[HexStr] = None
+    id_tac_dec: Optional[int] = None
+    id_eci_hex: Optional[HexStr] = None
+    id_eci_dec: Optional[int] = None
+    id_enb_id: Optional[int] = None
+    id_cell_id: Optional[int] = None
+    id_nci_hex: Optional[HexStr] = None
+    id_nci_dec: Optional[int] = None
+    id_gnb_id: Optional[int] = None
+    id_nci_cell_id: Optional[int] = None
+    id_rat: Optional[str] = None
+
+    @classmethod
+    def from_nested(cls, serving: LiveServingModel) -> "LiveServingFlat":
+        data = {"rat": serving.rat, "band": serving.band, "arfcn": serving.arfcn, "pci": serving.pci}
+        for prefix, sub in (("sa_", serving.sa), ("id_", serving.id)):
+            if sub is not None:
+                for name in type(sub).model_fields:
+                    data[prefix + name] = getattr(sub, name, None)
+        return cls.model_construct(**data)
+
+    def to_nested(self) -> LiveServingModel:
+        """按需还原嵌套视图；某组前缀字段全为 None 时对应子模型为 None"""
+        subs = {}
+        for key, prefix, sub_cls in (("sa", "sa_", ServingSA), ("id", "id_", CellIdNorm)):
+            vals = {name: getattr(self, prefix + name) for name in sub_cls.model_fields}
+            subs[key] = sub_cls.model_construct(**vals) if any(v is not None for v in vals.values()) else None
+        return LiveServingModel.model_construct(
+            rat=self.rat, band=self.band, arfcn=self.arfcn, pci=self.pci, **subs
+        )
+
 # ===== Step6: Neighbors & CA models (auto-added) =====
-class NbLTE(BaseModel):
+class NbLTE(_FastBase):
     earfcn: int
     pci: int
     rsrp: Optional[int] = None
@@ -164,7 +329,7 @@ class NbLTE(BaseModel):
     sinr: Optional[int] = None
     srxlev: Optional[int] = None
 
-class NbNR(BaseModel):
+class NbNR(_FastBase):
     nrarfcn: int
     pci: int
     rsrp: Optional[int] = None
@@ -172,11 +337,29 @@ class NbNR(BaseModel):
     sinr: Optional[int] = None
     scs_khz: Optional[int] = None
 
-class LiveNeighborsModel(BaseModel):
-    lte: List[NbLTE] = []
-    nr:  List[NbNR]  = []
+# 邻区行的 dict 形态（字段同 NbLTE / NbNR），/live 每次几十个，直接拼 dict
+class NbLTETD(TypedDict, total=False):
+    earfcn: int
+    pci: int
+    rsrp: Optional[int]
+    rsrq: Optional[int]
+    sinr: Optional[int]
+    srxlev: Optional[int]
+
+class NbNRTD(TypedDict, total=False):
+    nrarfcn: int
+    pci: int
+    rsrp: Optional[int]
+    rsrq: Optional[int]
+    sinr: Optional[int]
+    scs_khz: Optional[int]
+
+class LiveNeighborsModel(_FastBase):
+    lte: List[Union[NbLTE, NbLTETD]] = Field(default_factory=list)
+    nr:  List[Union[NbNR, NbNRTD]] = Field(default_factory=list)
 
-class CA_Pcc(BaseModel):
+class CA_Cell(_FastBase):
+    """PCC / SCC 共用一个模型（只差 idx），少建一份 validator/serializer"""
     rat: Optional[str] = None      # "LTE"/"NR"
     arfcn: Optional[int] = None
     dl_bw_mhz: Optional[int] = None
@@ -184,38 +367,83 @@ class CA_Pcc(BaseModel):
     rsrp: Optional[int] = None
     rsrq: Optional[int] = None
     sinr: Optional[int] = None
+    # SCC 序号；PCC 不带 idx，None 时不输出，JSON 与原 CA_Pcc 一致
+    idx: Optional[int] = Field(None, exclude_if=lambda v: v is None)
 
-class CA_Scc(CA_Pcc):
-    idx: int
+# 旧名保留
+CA_Pcc = CA_Cell
+CA_Scc = CA_Cell
 
-class LiveCAInfoModel(BaseModel):
-    pcc: Optional[CA_Pcc] = None
-    scc: List[CA_Scc] = []
+class LiveCAInfoModel(_FastBase):
+    pcc: Optional[CA_Cell] = None
+    scc: List[CA_Cell] = Field(default_factory=list)
     summary: Optional[str] = None
 # ===== /Step6 =====
 
-class LiveResponse(BaseModel):
+class TempsBlock(_FastBase):
+    """AT+QTEMP 解析结果；-273（无读数）已换成 None"""
+    ambient: Optional[int] = None
+    mmw: Optional[int] = None
+    pa: Dict[str, int] = Field(default_factory=dict)
+    baseband: Dict[str, int] = Field(default_factory=dict)
+    raw: Dict[str, Optional[int]] = Field(default_factory=dict)   # 原始传感器名 -> 读数
+
+# parse_qtemp_lines 直接产出的 dict 形态（字段同 TempsBlock）
+class TempsBlockTD(TypedDict, total=False):
+    ambient: Optional[int]
+    mmw: Optional[int]
+    pa: Dict[str, int]
+    baseband: Dict[str, int]
+    raw: Dict[str, Optional[int]]
+
+class LiveResponseFast(TrustedResponse):
+    """/live 常规轮询响应（不含 raw）；路由用 json_response() 直接序列化，不要加 response_model="""
     ok: bool = True
-    ts: int = Field(..., description="毫秒时间戳")
+    ts: int = Field(default_factory=_ms_now, description="毫秒时间戳")
     error: Optional[str] = Field(None, description="错误信息（成功时为 None）")
     reg: LiveRegModel = Field(default_factory=LiveRegModel)
     mode: LiveModeModel = Field(default_factory=LiveModeModel)
     operator: LiveOperatorModel = Field(default_factory=LiveOperatorModel)
-    signal: LiveSignalModel = Field(default_factory=LiveSignalModel)
+    signal: SignalBlock = Field(default_factory=SignalBlock)
     serving: LiveServingModel = Field(default_factory=LiveServingModel)
     neighbors: LiveNeighborsModel = Field(default_factory=LiveNeighborsModel)
     ca: LiveCAInfoModel = Field(default_factory=LiveCAInfoModel)
-    temps: Optional[Dict[str, Any]] = None
-    neighbours: List[NeighbourCell] = Field(default_factory=list)
+    temps: Optional[Union[TempsBlock, TempsBlockTD]] = None
+    # 默认逐行（AoS）；?layout=soa 时为 NeighbourCellsColumnar
+    neighbours: Union[List[NeighbourCell], NeighbourCellsColumnar] = Field(default_factory=list)
     netdev: Optional[LiveNetDev] = None
     session: Optional[LiveSessionModel] = None
     reg_detail: Optional[RegStatus] = None
     serving_norm: Optional[LiveServingModel] = None
-    signal_lte: Optional[SignalBlock] = None
-    signal_nr: Optional[SignalBlock] = None
-    raw: Optional[Dict[str, List[str]]] = None
-
-class NeighbourCell(BaseModel):
+    signal_lte: Optional[Union[SignalBlock, SignalBlockTD]] = None
+    signal_nr: Optional[Union[SignalBlock, SignalBlockTD]] = None
+
+class LiveResponse(LiveResponseFast):
+    """/live?verbose=1 的完整响应：在 LiveResponseFast 基础上带 raw 原始回显"""
+    raw: Optional[RawLog] = None
+
+LiveResponseFull = LiveResponse
+
+class LiveResponseFlat(LiveResponseFast):
+    """/live?shape=flat 的响应：serving / serving_norm 换成扁平形式，其余同 LiveResponseFast（不含 raw）"""
+    serving: LiveServingFlat = Field(default_factory=LiveServingFlat)
+    serving_norm: Optional[LiveServingFlat] = None
+
+    @classmethod
+    def from_live(cls, resp: LiveResponseFast) -> "LiveResponseFlat":
+        """按输入是否带 raw（verbose）选 LiveResponseFlat / LiveResponseFlatFull"""
+        target = LiveResponseFlatFull if isinstance(resp, LiveResponse) else LiveResponseFlat
+        data = {name: getattr(resp, name, None) for name in target.model_fields}
+        data["serving"] = LiveServingFlat.from_nested(resp.serving)
+        if resp.serving_norm is not None:
+            data["serving_norm"] = LiveServingFlat.from_nested(resp.serving_norm)
+        return target.model_construct(**data)
+
+class LiveResponseFlatFull(LiveResponseFlat):
+    """/live?shape=flat&verbose=1：扁平 serving + raw 原始回显"""
+    raw: Optional[RawLog] = None
+
+class NeighbourCell(_FastBase):
     rat: Optional[str] = None
     mode: Optional[str] = None
     mcc: Optional[int] = None
@@ -231,7 +459,38 @@ class NeighbourCell(BaseModel):
     rssi: Optional[int] = None
     sinr: Optional[int] = None
 
-class LiveNetDev(BaseModel):
+class NeighbourCellsColumnar(_FastBase):
+    """/live?layout=soa 的 neighbours：按字段分列（每列等长），字段同 NeighbourCell"""
+    rat: List[Optional[str]] = Field(default_factory=list)
+    mode: List[Optional[str]] = Field(default_factory=list)
+    mcc: List[Optional[int]] = Field(default_factory=list)
+    mnc: List[Optional[int]] = Field(default_factory=list)
+    tac: List[Optional[str]] = Field(default_factory=list)
+    ci: List[Optional[str]] = Field(default_factory=list)
+    pci: List[Optional[int]] = Field(default_factory=list)
+    earfcn: List[Optional[int]] = Field(default_factory=list)
+    nrarfcn: List[Optional[int]] = Field(default_factory=list)
+    band: List[Optional[str]] = Field(default_factory=list)
+    rsrp: List[Optional[int]] = Field(default_factory=list)
+    rsrq: List[Optional[int]] = Field(default_factory=list)
+    rssi: List[Optional[int]] = Field(default_factory=list)
+    sinr: List[Optional[int]] = Field(default_factory=list)
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "NeighbourCellsColumnar":
+        # 直接从解析出的 dict 行转列，不经过 NeighbourCell 对象
+        return cls.model_construct(**{
+            name: [r.get(name) for r in rows] for name in NeighbourCell.model_fields
+        })
+
+    def to_rows(self) -> List[NeighbourCell]:
+        cols = [getattr(self, name) for name in NeighbourCell.model_fields]
+        return [
+            NeighbourCell.model_construct(**dict(zip(NeighbourCell.model_fields, vals)))
+            for vals in zip(*cols)
+        ]
+
+class LiveNetDev(_FastBase):
     iface: Optional[str] = None
     state: Optional[str] = None
     ipv4: Optional[str] = None
@@ -240,7 +499,7 @@ class LiveNetDev(BaseModel):
     rx_rate_bps: Optional[int] = None
     tx_rate_bps: Optional[int] = None
 
-class PDPContext(BaseModel):
+class PDPContext(_FastBase):
     cid: int
     type: Optional[str] = None   # e.g. "IP","IPV6","IPV4V6"
     apn: Optional[str] = None
@@ -249,53 +508,76 @@ class PDPContext(BaseModel):
     dns1: Optional[str] = None
     dns2: Optional[str] = None
 
-class LiveSessionModel(BaseModel):
+class PDPContextTD(TypedDict, total=False):
+    cid: int
+    type: Optional[str]
+    apn: Optional[str]
+    state: Optional[int]
+    ip: Optional[str]
+    dns1: Optional[str]
+    dns2: Optional[str]
+
+class LiveSessionModel(_FastBase):
     default_cid: Optional[int] = None
-    pdp: List[PDPContext] = []
+    pdp: List[Union[PDPContext, PDPContextTD]] = Field(default_factory=list)
 
 # ===== Step-2: Control API Models =====
 
-class CtrlBaseRequest(BaseModel):
+class CtrlBaseRequest(_FastBase):
     """所有控制请求的基类，包含 dry_run 字段"""
     dry_run: bool = False
 
 
-class CtrlActionDetail(BaseModel):
+class CtrlActionDetail(_FastBase):
     """统一的控制动作详情结构"""
     dry_run: bool
     dangerous: bool
     executed: bool
     blocked_reason: Optional[str] = None
-    planned: List[str] = []
-    errors: List[str] = []
+    planned: List[str] = Field(default_factory=list)
+    errors: List[str] = Field(default_factory=list)
     extra: Optional[Dict[str, Any]] = None
 
 
-class CtrlBaseResponse(BaseModel):
+class CtrlActionDetailTD(TypedDict, total=False):
+    dry_run: bool
+    dangerous: bool
+    executed: bool
+    blocked_reason: Optional[str]
+    planned: List[str]
+    errors: List[str]
+    extra: Optional[Dict[str, Any]]
+
+
+class CtrlBaseResponse(TrustedResponse):
     ok: bool = True
-    ts: int = Field(default_factory=lambda: int(time.time() * 1000))
+    ts: int = Field(default_factory=_ms_now, description="毫秒级时间戳")
     action: str
     error: Optional[str] = None
     # 未来放 AT 回显：{ "AT+XXX": ["AT+XXX", "...", "OK"] }
-    raw: Optional[Dict[str, List[str]]] = None
+    raw: Optional[RawLog] = None
     # 每个动作专属的内容（统一使用 CtrlActionDetail）
-    detail: CtrlActionDetail
+    detail: Union[CtrlActionDetail, CtrlActionDetailTD]
 
 
 # 模组重启
 class CtrlRebootRequest(CtrlBaseRequest):
-    mode: str = Field("soft", description="soft|full|rf_off")
+    mode: Literal["soft", "full", "rf_off"] = Field("soft", description="soft|full|rf_off")
 
 
 # USBNet 切换
 class CtrlUsbNetRequest(CtrlBaseRequest):
-    mode: str = Field(..., description="rndis|ecm|mbim 等")
+    # _plan_usbnet 按小写查表，大写写法照旧放行
+    mode: Literal["rndis", "ecm", "ncm", "mbim", "auto", "RNDIS", "ECM", "NCM", "MBIM", "AUTO"] = Field(
+        ..., description="rndis|ecm|ncm|mbim|auto"
+    )
     reboot_modem: bool = False
 
 
 # APN/PDP 配置
-class CtrlApnAuth(BaseModel):
-    type: str = Field("none", description="none|pap|chap")
+class CtrlApnAuth(_FastBase):
+    model_config = ConfigDict(frozen=True)  # 只读；构造后不会被改
+    type: Literal["none", "pap", "chap", "NONE", "PAP", "CHAP"] = Field("none", description="none|pap|chap")
     user: Optional[str] = None
     password: Optional[str] = None
 
@@ -304,7 +586,7 @@ class CtrlApnRequest(CtrlBaseRequest):
     cid: int = 1
     apn: str
     pdp_type: str = Field("IPV4V6", description="IP|IPV6|IPV4V6")
-    auth: CtrlApnAuth = CtrlApnAuth()
+    auth: CtrlApnAuth = Field(default_factory=CtrlApnAuth)
     activate: bool = True
 
 
@@ -315,7 +597,7 @@ class CtrlRoamingRequest(CtrlBaseRequest):
 
 # Band 偏好（软锁频段）
 class CtrlBandRequest(CtrlBaseRequest):
-    rat: str = Field("BOTH", description="LTE|NR5G|BOTH")
+    rat: Literal["LTE", "NR5G", "BOTH"] = Field("BOTH", description="LTE|NR5G|BOTH")
     lte_bands: Optional[List[str]] = None
     nr_bands: Optional[List[str]] = None
     reset: bool = False
@@ -326,7 +608,7 @@ class CtrlCellLockRequest(CtrlBaseRequest):
     enable: bool
     rat: Optional[str] = None
     pci: Optional[int] = None
-    tac: Optional[str] = Field(None, description="十六进制 TAC，如 '0800'")
+    tac: Optional[HexStr] = Field(None, description="十六进制 TAC，如 '0800'")
     cell_id: Optional[str] = None
 
 
@@ -360,7 +642,7 @@ class CtrlNetworkModeRequest(CtrlBaseRequest):
     网络模式选择请求。
     用于设置模组的上网模式偏好（AUTO/WCDMA/LTE/NR5G等）。
     """
-    mode_pref: Optional[str] = Field(
+    mode_pref: Optional[ModePrefStr] = Field(
         None,
         description='网络搜索模式：AUTO（自动）、WCDMA（仅WCDMA）、LTE（仅LTE）、NR5G（仅5G），或组合如"LTE:NR5G"（LTE和5G）。查询时省略此字段。'
     )
@@ -387,54 +669,90 @@ class CtrlBandPreferenceRequest(CtrlBaseRequest):
 
 
 # ===== 网络模式查询响应模型 =====
-class NetworkModeState(BaseModel):
+class NetworkModeState(_FastBase):
     mode_pref: Optional[str] = Field(None, description="当前网络搜索模式，如AUTO、LTE、NR5G、LTE:NR5G等")
 
 
-class NetworkModeResponse(BaseModel):
+class NetworkModeResponse(TrustedResponse):
     ok: bool = Field(True, description="调用是否成功")
-    ts: int = Field(..., description="毫秒级时间戳")
+    ts: int = Field(default_factory=_ms_now, description="毫秒级时间戳")
     error: Optional[str] = Field(None, description="错误信息（成功时为 None）")
     mode: NetworkModeState = Field(..., description="网络模式状态")
     raw: Optional[List[str]] = Field(None, description="原始 AT 回显行列表（可选）")
 
 
 # ===== 频段偏好查询响应模型 =====
-class BandPreferenceState(BaseModel):
+class BandPreferenceState(_FastBase):
     lte_bands: Optional[List[int]] = Field(None, description="当前LTE频段偏好列表")
     nsa_nr5g_bands: Optional[List[int]] = Field(None, description="当前5G NSA频段偏好列表")
     nr5g_bands: Optional[List[int]] = Field(None, description="当前5G SA频段偏好列表")
 
 
-class BandPreferenceResponse(BaseModel):
+class BandPreferenceResponse(TrustedResponse):
     ok: bool = Field(True, description="调用是否成功")
-    ts: int = Field(..., description="毫秒级时间戳")
+    ts: int = Field(default_factory=_ms_now, description="毫秒级时间戳")
     error: Optional[str] = Field(None, description="错误信息（成功时为 None）")
     bands: BandPreferenceState = Field(..., description="频段偏好状态")
     raw: Optional[List[str]] = Field(None, description="原始 AT 回显行列表（可选）")
 
 
 # ===== 漫游查询响应模型 =====
-class RoamingState(BaseModel):
+class RoamingState(_FastBase):
     enabled: bool = Field(..., description="数据漫游是否开启")
 
 
-class RoamingResponse(BaseModel):
+class RoamingResponse(TrustedResponse):
     ok: bool = Field(True, description="调用是否成功")
-    ts: int = Field(..., description="毫秒级时间戳")
+    ts: int = Field(default_factory=_ms_now, description="毫秒级时间戳")
     error: Optional[str] = Field(None, description="错误信息（成功时为 None）")
     roaming: RoamingState = Field(..., description="漫游状态")
     raw: Optional[List[str]] = Field(None, description="原始 AT 回显行列表（可选）")
 
 
 # ===== 上网出口切换请求/响应模型 =====
-class UplinkRequest(BaseModel):
+class UplinkRequest(_FastBase):
     mode: Literal["sim", "wifi"] = Field(..., description="上网出口模式：sim=SIM卡优先，wifi=Wi-Fi优先")
 
 
-class UplinkResponse(BaseModel):
+class UplinkResponse(TrustedResponse):
     ok: bool = Field(True, description="调用是否成功")
-    ts: int = Field(..., description="毫秒级时间戳")
+    ts: int = Field(default_factory=_ms_now, description="毫秒级时间戳")
     error: Optional[str] = Field(None, description="错误信息（成功时为 None）")
     mode: Optional[Literal["sim", "wifi"]] = Field(None, description="当前或设置后的上网出口模式")
     default_route: Optional[str] = Field(None, description="当前默认路由信息（ip route 输出）")
+
+
+# ===== 生产环境裁掉字段说明 =====
+# 只清 description；metadata 里还有 pattern 等约束，不能动
+def _all_models(base: type):
+    for sub in base.__subclasses__():
+        yield sub
+        yield from _all_models(sub)
+
+if config.STRIP_SCHEMA_DOCS:
+    _models = set(_all_models(_FastBase))
+    for _m in _models:
+        for _fi in _m.model_fields.values():
+            _fi.description = None
+    for _m in _models:
+        _m.model_rebuild(force=True)
+    del _m, _fi, _models
+
+
+# ===== 导入时一次性构建响应模型 =====
+# LiveResponse 前向引用了下方定义的 NeighbourCell / LiveNetDev 等，且基类是 defer_build；
+# 在这里统一 rebuild，把 schema 构建放到启动阶段，而不是压在第一个请求上
+for _m in (
+    InfoResponse,
+    LiveResponseFast,
+    LiveResponse,
+    LiveResponseFlat,
+    LiveResponseFlatFull,
+    CtrlBaseResponse,
+    NetworkModeResponse,
+    BandPreferenceResponse,
+    RoamingResponse,
+    UplinkResponse,
+):
+    _m.model_rebuild()
+del _m
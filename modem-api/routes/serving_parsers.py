@@ -1,12 +1,17 @@
 # coding: utf-8
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, Tuple
+from bisect import bisect_right
+from functools import lru_cache
 import re
 
 def _first_qeng_line(lines: List[str], tag: str) -> Optional[str]:
+    # 标签串只拼一次；先用 in 粗筛，命中的行才 strip
+    needle = '"' + tag + '"'
     for s in lines:
-        t = s.strip()
-        if t.startswith("+QENG:") and f'"{tag}"' in t:
-            return t
+        if needle in s and "+QENG:" in s:
+            t = s.strip()
+            if t.startswith("+QENG:"):
+                return t
     return None
 
 def _payload_after_first_quoted_tag(line: str) -> str:
@@ -19,6 +24,12 @@ def _payload_after_first_quoted_tag(line: str) -> str:
         return ""
 
 def _split_csv_tokens(payload: str) -> List[str]:
+    # 快路径：每段引号成对（逗号都不在引号内）时直接 split；末尾空段与下方循环一致地丢弃
+    parts = payload.split(",")
+    if '"' not in payload or all(t.count('"') % 2 == 0 for t in parts):
+        if parts[-1] == "":
+            parts.pop()
+        return [t.strip() for t in parts]
     res, cur, q = [], "", False
     for ch in payload:
         if ch == '"':
@@ -32,8 +43,14 @@ def _split_csv_tokens(payload: str) -> List[str]:
     return res
 
 def _to_int(x: Any) -> Optional[int]:
+    s = x.strip() if isinstance(x, str) else str(x).strip()
+    # 快路径：纯数字直接转；首字符就能判否的不走异常
+    if s.isdecimal():
+        return int(s)
+    if not s or not (s[0].isdecimal() or s[0] in "+-"):
+        return None
     try:
-        v = int(str(x).strip(), 10)
+        v = int(s, 10)
         return None if v == -32768 else v
     except Exception:
         return None
@@ -110,7 +127,8 @@ QTEMP_ALIAS = {
     "mdmss-3-usr": ("baseband", "mdmss_3_usr"),
 }
 
-_qtemp_pat = re.compile(r'\+QTEMP:"([^"]+)"\s*,\s*"(-?\d+)"')
+# 整段回显一次 finditer：^ + 惰性前缀 = 每行只取第一处匹配（同逐行 search），且不跨行
+_qtemp_pat = re.compile(r'^[^\n]*?\+QTEMP:"([^"\n]+)"[^\S\n]*,[^\S\n]*"(-?\d+)"', re.M)
 
 
 def parse_qtemp_lines(at_qtemp_lines: List[str]) -> Dict:
@@ -125,47 +143,28 @@ def parse_qtemp_lines(at_qtemp_lines: List[str]) -> Dict:
     }
     说明：返回 -273 视为 None（无读数）
     """
-    ambient: Optional[int] = None
-    mmw: Optional[int] = None
-    pa: Dict[str, int] = {}
-    base: Dict[str, int] = {}
     raw: Dict[str, Optional[int]] = {}
-    for ln in at_qtemp_lines or []:
-        m = _qtemp_pat.search(ln)
-        if not m:
-            continue
-        key, sval = m.group(1), m.group(2)
-        try:
-            v = int(sval)
-        except Exception:
-            v = None
-        v_std: Optional[int]
-        if v == -273:
-            v_std = None
-        else:
-            v_std = v
+    out: Dict[str, Any] = {"ambient": None, "mmw": None, "pa": {}, "baseband": {}, "raw": raw}
+    base = out["baseband"]
+    alias = QTEMP_ALIAS.get
+    # findall 直接给 (key, val) 元组，省掉每行两次 m.group()
+    for key, sval in _qtemp_pat.findall("\n".join(at_qtemp_lines or ())):
+        v = int(sval)
+        v_std = None if v == -273 else v
         raw[key] = v_std
-        grp = QTEMP_ALIAS.get(key)
+        grp = alias(key)
         if not grp:
             if v_std is not None:
                 base[key.replace("-", "_")] = v_std
             continue
         cat, sub = grp
-        if cat == "ambient":
-            ambient = v_std
-        elif cat == "mmw":
-            mmw = v_std
-        elif cat == "pa" and sub and v_std is not None:
-            pa[sub] = v_std
-        elif cat == "baseband" and sub and v_std is not None:
-            base[sub] = v_std
-    return {
-        "ambient": ambient,
-        "mmw": mmw,
-        "pa": pa,
-        "baseband": base,
-        "raw": raw,
-    }
+        if sub is None:
+            # ambient / mmw：标量，无读数也照写 None
+            out[cat] = v_std
+        elif v_std is not None:
+            # pa / baseband：按子名归档
+            out[cat][sub] = v_std
+    return out
 
 
 _qcainfo_pcc_pat = re.compile(
@@ -173,15 +172,19 @@ _qcainfo_pcc_pat = re.compile(
 )
 
 
+# 映射表：bandwidth值 -> MHz
+_BW_MAP = {6: 1, 15: 3, 25: 5, 50: 10, 75: 15, 100: 20}
+
+
+# 取值只有几种，逐行 SCC 都会调用，按原始字符串缓存
+@lru_cache(maxsize=32)
 def _parse_bandwidth_to_mhz(bw_val: str) -> Optional[int]:
     """将带宽值转换为MHz。根据官方文档，bandwidth值对应：6=1.4MHz, 15=3MHz, 25=5MHz, 50=10MHz, 75=15MHz, 100=20MHz"""
     try:
         bw_int = int(bw_val)
-        # 映射表：bandwidth值 -> MHz
-        bw_map = {6: 1, 15: 3, 25: 5, 50: 10, 75: 15, 100: 20}
-        return bw_map.get(bw_int, bw_int if bw_int < 100 else None)
     except Exception:
         return None
+    return _BW_MAP.get(bw_int, bw_int if bw_int < 100 else None)
 
 
 def parse_qcainfo(at_qcainfo_lines: List[str]) -> Tuple[Optional[dict], List[dict]]:
@@ -260,6 +263,9 @@ def parse_qcainfo(at_qcainfo_lines: List[str]) -> Tuple[Optional[dict], List[dic
 # --- CA (SCC) Parsers: QCAINFO / QENG fallback ---------------------------------
 
 def _clean_token(tok: str) -> str:
+    # 多数 token 不带引号：一次 strip 就是最终结果
+    if '"' not in tok:
+        return tok.strip()
     return tok.strip().strip('"').strip()
 
 
@@ -267,6 +273,10 @@ def _as_int(x: Optional[str]) -> Optional[int]:
     if x is None: return None
     s = str(x).strip()
     if s in ("", "-", "null", "None"): return None
+    # 快路径：位数不多的纯数字，经 float 往返不丢精度，直接 int
+    if len(s) < 16 and (s.isdecimal() or (s[0] == "-" and s[1:].isdecimal())):
+        v = int(s)
+        return None if v == -32768 else v
     try:
         v = int(float(s))
         if v == -32768:
@@ -283,6 +293,11 @@ def _as_mhz(x: Optional[str]) -> Optional[int]:
     return _as_int(s)
 
 
+# SCC 行预筛：第一个冒号后的首段去掉空白/引号后以 SCC 开头（与下面 head 判断一致），
+# 其余 PCC/噪声行不再整行切分、逐段清洗
+_qcainfo_scc_head_pat = re.compile(r'^[^:]*:\s*"*\s*SCC', re.I)
+
+
 def parse_qcainfo_scc(lines: List[str]) -> List[Dict]:
     """
     Parse SCC rows from AT+QCAINFO.
@@ -293,7 +308,7 @@ def parse_qcainfo_scc(lines: List[str]) -> List[Dict]:
     """
     scc_list: List[Dict] = []
     for ln in lines or []:
-        if "+QCAINFO" not in ln:
+        if "+QCAINFO" not in ln or not _qcainfo_scc_head_pat.match(ln):
             continue
         raw = ln.split(":", 1)[-1]
         parts = [_clean_token(p) for p in raw.split(",")]
@@ -366,19 +381,13 @@ def parse_qcainfo_scc(lines: List[str]) -> List[Dict]:
                 nrarfcn = _as_int(val or t)
                 continue
             # simple positional best-effort for RSRP/RSRQ/SINR if tokens look numeric
-            if rsrp is None and t.replace("-", "").isdigit():
-                # try assign in order RSRP->RSRQ->SINR
+            # (numeric check + int conversion once per token, then fill in order RSRP->RSRQ->SINR)
+            if sinr is None and _int_tok_pat.fullmatch(t):
                 val = _as_int(t)
                 if val is not None:
-                    if rsrp is None: rsrp = val; continue
-            elif rsrq is None and t.replace("-", "").isdigit():
-                val = _as_int(t)
-                if val is not None:
-                    if rsrq is None: rsrq = val; continue
-            elif sinr is None and t.replace("-", "").isdigit():
-                val = _as_int(t)
-                if val is not None:
-                    if sinr is None: sinr = val; continue
+                    if rsrp is None: rsrp = val
+                    elif rsrq is None: rsrq = val
+                    else: sinr = val
 
         # normalize by RAT
         if rat and rat.upper().startswith("NR"):
@@ -415,7 +424,7 @@ def parse_qeng_scc_from_serving(lines: List[str]) -> List[Dict]:
 
 def _tok(s: Optional[str]) -> Optional[str]:
     if s is None: return None
-    ss = s.strip().strip('"').strip()
+    ss = s.strip() if '"' not in s else s.strip().strip('"').strip()
     return ss or None
 
 
@@ -423,6 +432,8 @@ def _to_int_or_none(s: Optional[str]) -> Optional[int]:
     if s is None: return None
     v = s.strip().lower().replace("mhz", "")
     if v in ("", "-", "null", "none"): return None
+    if v.isdecimal() and len(v) < 16:  # 最常见的纯数字直接转（位数受限，与 float 路径结果一致）
+        return int(v)
     try:
         iv = int(float(v))
         if iv == -32768:
@@ -432,28 +443,128 @@ def _to_int_or_none(s: Optional[str]) -> Optional[int]:
         return None
 
 
+# 粗略映射，尽量保守；命中常见频段即可。(起, 止, 频段) 按起点升序、区间互不重叠，二分查找
+_LTE_BANDS = (
+    (0, 599, "B1"),
+    (1200, 1949, "B3"),
+    (37750, 38249, "B34"),
+    (38250, 38649, "B38"),
+    (38650, 39649, "B39"),
+    (39650, 41589, "B40"),
+    (41590, 43589, "B41"),
+)
+_LTE_BAND_STARTS = tuple(r[0] for r in _LTE_BANDS)
+
+_NR_BANDS = (
+    (151600, 160600, "n28"),
+    (422000, 434000, "n1"),
+    (499200, 537999, "n41"),
+    (620000, 680000, "n78"),
+)
+_NR_BAND_STARTS = tuple(r[0] for r in _NR_BANDS)
+
+
+def _band_in_table(n: int, starts: Tuple[int, ...], table: Tuple[Tuple[int, int, str], ...]) -> Optional[str]:
+    i = bisect_right(starts, n) - 1
+    if i < 0:
+        return None
+    lo, hi, band = table[i]
+    return band if lo <= n <= hi else None
+
+
 def _guess_lte_band_from_earfcn(earfcn: Optional[int]) -> Optional[str]:
     if earfcn is None: return None
-    n = earfcn
-    # 粗略映射，尽量保守；命中常见频段即可
-    if 0 <= n <= 599: return "B1"
-    if 1200 <= n <= 1949: return "B3"
-    if 37750 <= n <= 38249: return "B34"
-    if 38250 <= n <= 38649: return "B38"
-    if 38650 <= n <= 39649: return "B39"
-    if 39650 <= n <= 41589: return "B40"
-    if 41590 <= n <= 43589: return "B41"
-    return None
+    return _band_in_table(earfcn, _LTE_BAND_STARTS, _LTE_BANDS)
 
 
 def _guess_nr_band_from_nrarfcn(nrarfcn: Optional[int]) -> Optional[str]:
     if nrarfcn is None: return None
-    n = nrarfcn
-    if 499200 <= n <= 537999: return "n41"
-    if 620000 <= n <= 680000: return "n78"
-    if 151600 <= n <= 160600: return "n28"
-    if 422000 <= n <= 434000: return "n1"
-    return None
+    return _band_in_table(nrarfcn, _NR_BAND_STARTS, _NR_BANDS)
+
+
+# 邻区行字段：LTE / NR 各合成一条交替式，一行只扫一遍（命名组即字段名）
+_nb_lte_scan_pat = re.compile(
+    r"EARFCN[=\s:]+(?P<earfcn>-?\d+)|PCI[=\s:]+(?P<pci>-?\d+)|RSRP[=\s:]+(?P<rsrp>-?\d+)"
+    r"|RSRQ[=\s:]+(?P<rsrq>-?\d+)|RSSI[=\s:]+(?P<rssi>-?\d+)",
+    re.I,
+)
+_nb_nr_scan_pat = re.compile(
+    r"\bPCI[=\s:]+(?P<pci>-?\d+)|SS-?RSRP[=\s:]+(?P<rsrp>-?\d+)|SS-?RSRQ[=\s:]+(?P<rsrq>-?\d+)"
+    r"|SINR[=\s:]+(?P<sinr>-?\d+)|NRARFCN[=\s:]+(?P<nrarfcn>-?\d+)",
+    re.I,
+)
+_nb_tac_pat = re.compile(r'\b([0-9A-Fa-f]{4,})\b')
+_nb_ci_pat = re.compile(r'\b([0-9A-Fa-f]{5,})\b')
+_int_tok_pat = re.compile(r"-?\d+")
+_int_tok_b_pat = re.compile(rb"-?\d+")
+
+
+def _scan_nb_fields(pat: "re.Pattern[str]", ln: str) -> Dict[str, Optional[int]]:
+    """单次 finditer 取各字段；同一字段只认第一次出现（与逐个 re.search 结果一致）"""
+    found: Dict[str, Optional[int]] = {}
+    for m in pat.finditer(ln):
+        k = m.lastgroup
+        if k not in found:
+            found[k] = _to_int_or_none(m[k])
+    return found
+
+
+def _nb_row(rat, mode, mcc=None, mnc=None, tac=None, ci=None, pci=None,
+            earfcn=None, nrarfcn=None, band=None,
+            rsrp=None, rsrq=None, rssi=None, sinr=None) -> Dict:
+    return {
+        "rat": rat, "mode": mode,
+        "mcc": mcc, "mnc": mnc,
+        "tac": tac, "ci": ci,
+        "pci": pci,
+        "earfcn": earfcn, "nrarfcn": nrarfcn,
+        "band": band,
+        "rsrp": rsrp, "rsrq": rsrq, "rssi": rssi, "sinr": sinr,
+    }
+
+
+def _nb_mcc_mnc(parts: List[str]) -> Tuple[Optional[int], Optional[int]]:
+    # MCC/MNC 从 parts（去引号后）按位置兜底：位置并不完全可靠，但通常靠前
+    ints = [p for p in parts if p and _int_tok_pat.fullmatch(p)]
+    if len(ints) >= 2:
+        return _to_int_or_none(ints[0]), _to_int_or_none(ints[1])
+    return None, None
+
+
+def _parse_lte_neigh(ln: str, parts: List[str], mode: Optional[str]) -> Dict:
+    # LTE 邻区常见顺序（可能有出入）：MCC,MNC,TAC,CI,EARFCN,PCI,RSRQ,RSRP,RSSI
+    # 优先关键字粗提 EARFCN / PCI / 三强指标，MCC/MNC 再按数字位置兜底
+    f = _scan_nb_fields(_nb_lte_scan_pat, ln)
+    earfcn = f.get("earfcn")
+    mcc, mnc = _nb_mcc_mnc(parts)
+    # TAC/CI 可能是十六进制或十进制，保持字符串原样
+    tac_m = _nb_tac_pat.search(ln)
+    ci_m  = _nb_ci_pat.search(ln)
+    return _nb_row(
+        "LTE", mode, mcc=mcc, mnc=mnc,
+        tac=tac_m.group(1) if tac_m else None,
+        ci=ci_m.group(1) if ci_m else None,
+        pci=f.get("pci"), earfcn=earfcn,
+        band=_guess_lte_band_from_earfcn(earfcn),
+        rsrp=f.get("rsrp"), rsrq=f.get("rsrq"), rssi=f.get("rssi"),
+    )
+
+
+def _parse_nr_neigh(ln: str, parts: List[str], mode: Optional[str]) -> Dict:
+    # NR 邻区常见顺序：MCC,MNC,PCI,SS-RSRP,SS-RSRQ,SS-SINR,NRARFCN,SCS,...
+    f = _scan_nb_fields(_nb_nr_scan_pat, ln)
+    nrarfcn = f.get("nrarfcn")
+    mcc, mnc = _nb_mcc_mnc(parts)
+    return _nb_row(
+        "NR5G", mode, mcc=mcc, mnc=mnc,
+        pci=f.get("pci"), nrarfcn=nrarfcn,
+        band=_guess_nr_band_from_nrarfcn(nrarfcn),
+        rsrp=f.get("rsrp"), rsrq=f.get("rsrq"), sinr=f.get("sinr"),
+    )
+
+
+# RAT -> 行解析器；每种 RAT 只跑自己的正则
+_NB_RAT_DISPATCH = {"LTE": _parse_lte_neigh, "NR5G": _parse_nr_neigh}
 
 
 def parse_qeng_neighbour(lines: List[str]) -> List[Dict]:
@@ -464,8 +575,10 @@ def parse_qeng_neighbour(lines: List[str]) -> List[Dict]:
     取能稳定识别的字段，其余置 None；出现异常不抛错。
     """
     out: List[Dict] = []
+    dispatch = _NB_RAT_DISPATCH.get
     for ln in lines or []:
-        if "+QENG" not in ln or "neighbourcell" not in ln.lower():
+        # 模组回显本来就是小写 neighbourcell：先按原样找，找不到才 lower() 复制整行
+        if "+QENG" not in ln or ("neighbourcell" not in ln and "neighbourcell" not in ln.lower()):
             continue
         # 拆主干
         try:
@@ -474,85 +587,20 @@ def parse_qeng_neighbour(lines: List[str]) -> List[Dict]:
             continue
         # 基于逗号粗切，再去引号
         parts = [_tok(p) for p in payload.split(",")]
-        # 找 RAT
+        # 找 RAT：先扫前 4 个槽位里是否有 LTE/NR5G / FDD/TDD
         rat = None
         mode = None
         if len(parts) >= 2:
-            # 可能出现 "...","LTE","FDD",... 或 "...","NR5G",...
-            # 先扫前 4 个槽位里是否有 LTE/NR5G / FDD/TDD
-            head = [p for p in parts[:4] if p]
-            for p in head:
+            for p in parts[:4]:
+                if not p:
+                    continue
                 up = p.upper()
                 if up in ("LTE", "NR5G"):
                     rat = up
                 if up in ("FDD", "TDD"):
                     mode = up
-        # 抽数字（通用）
-        nums = re.findall(r"-?\d+", ln)
-        mcc = None; mnc = None; tac = None; ci = None
-        pci = None; rsrp = None; rsrq = None; rssi = None; sinr = None
-        earfcn = None; nrarfcn = None
-        if rat == "LTE":
-            # LTE 邻区常见顺序（可能有出入）：MCC,MNC,TAC,CI,EARFCN,PCI,RSRQ,RSRP,RSSI
-            # 尝试按 tokens 再用数字兜底
-            # 从 parts 中定位 earfcn/pci/rsrp/rsrq/rssi
-            # 优先关键字，再回落到数字序列位置
-            # 直接用数字数组作为容错来源：
-            #   按照最后 6~8 个数，依次匹配 PCI/RSRQ/RSRP/RSSI 等
-            #   保守起见只要拿到 EARFCN/PCI/RSRP/RSRQ/RSSI 就行
-            # 粗提 EARFCN
-            m = re.search(r"EARFCN[=\s:]+(-?\d+)", ln, re.I)
-            if m: earfcn = _to_int_or_none(m.group(1))
-            # 粗提 PCI
-            m = re.search(r"PCI[=\s:]+(-?\d+)", ln, re.I)
-            if m: pci = _to_int_or_none(m.group(1))
-            # 三强指标
-            m = re.search(r"RSRP[=\s:]+(-?\d+)", ln, re.I)
-            if m: rsrp = _to_int_or_none(m.group(1))
-            m = re.search(r"RSRQ[=\s:]+(-?\d+)", ln, re.I)
-            if m: rsrq = _to_int_or_none(m.group(1))
-            m = re.search(r"RSSI[=\s:]+(-?\d+)", ln, re.I)
-            if m: rssi = _to_int_or_none(m.group(1))
-            # MCC/MNC/TAC/CI 尝试从 parts（去引号后）按位置兜底
-            # 位置并不完全可靠，但通常在 LTE 邻区行靠前
-            ints = [p for p in parts if p and re.fullmatch(r"-?\d+", p)]
-            if len(ints) >= 2:
-                mcc = _to_int_or_none(ints[0]); mnc = _to_int_or_none(ints[1])
-            # TAC/CI 可能是十六进制或十进制，保持字符串原样
-            tac_m = re.search(r'\b([0-9A-Fa-f]{4,})\b', ln)
-            ci_m  = re.search(r'\b([0-9A-Fa-f]{5,})\b', ln)
-            if tac_m: tac = tac_m.group(1)
-            if ci_m:  ci  = ci_m.group(1)
-        elif rat == "NR5G":
-            # NR 邻区常见顺序：MCC,MNC,PCI,SS-RSRP,SS-RSRQ,SS-SINR,NRARFCN,SCS,...
-            m = re.search(r"\bPCI[=\s:]+(-?\d+)", ln, re.I)
-            if m: pci = _to_int_or_none(m.group(1))
-            m = re.search(r"SS-?RSRP[=\s:]+(-?\d+)", ln, re.I)
-            if m: rsrp = _to_int_or_none(m.group(1))
-            m = re.search(r"SS-?RSRQ[=\s:]+(-?\d+)", ln, re.I)
-            if m: rsrq = _to_int_or_none(m.group(1))
-            m = re.search(r"SINR[=\s:]+(-?\d+)", ln, re.I)
-            if m: sinr = _to_int_or_none(m.group(1))
-            m = re.search(r"NRARFCN[=\s:]+(-?\d+)", ln, re.I)
-            if m: nrarfcn = _to_int_or_none(m.group(1))
-            ints = [p for p in parts if p and re.fullmatch(r"-?\d+", p)]
-            if len(ints) >= 2:
-                mcc = _to_int_or_none(ints[0]); mnc = _to_int_or_none(ints[1])
-        # 频段推断
-        band = None
-        if rat == "LTE":
-            band = _guess_lte_band_from_earfcn(earfcn)
-        elif rat == "NR5G":
-            band = _guess_nr_band_from_nrarfcn(nrarfcn)
-        out.append({
-            "rat": rat, "mode": mode,
-            "mcc": mcc, "mnc": mnc,
-            "tac": tac, "ci": ci,
-            "pci": pci,
-            "earfcn": earfcn, "nrarfcn": nrarfcn,
-            "band": band,
-            "rsrp": rsrp, "rsrq": rsrq, "rssi": rssi, "sinr": sinr,
-        })
+        handler = dispatch(rat)
+        out.append(handler(ln, parts, mode) if handler else _nb_row(rat, mode))
     return out
 
 
@@ -564,34 +612,31 @@ def _nz(v):
 
 def _band_of(cell: Dict[str, Any]) -> Optional[str]:
     # 允许 key 叫 "band" 或 "nr_band"/"lte_band"
-    for k in ("band", "nr_band", "lte_band"):
-        b = cell.get(k)
-        if b:
-            return str(b)
-    return None
+    b = cell.get("band") or cell.get("nr_band") or cell.get("lte_band")
+    return str(b) if b else None
 
 
 def _arfcn_of(cell: Dict[str, Any]) -> Optional[int]:
-    for k in ("arfcn", "nrarfcn", "earfcn"):
-        v = cell.get(k)
-        if isinstance(v, int):
-            return v
-        try:
-            return int(v) if v not in (None, "", "-") else None
-        except Exception:
-            pass
-    return None
+    v = cell.get("arfcn") or cell.get("nrarfcn") or cell.get("earfcn")
+    if isinstance(v, int):
+        return v
+    if v in (None, "", "-"):
+        return None
+    try:
+        return int(v)
+    except Exception:
+        return None
 
 
 def _bw_of(cell: Dict[str, Any]) -> Optional[int]:
     # 约定 dl_bw_mhz；若是 kHz/Hz 请在解析处已归一
-    for k in ("dl_bw_mhz", "bw_mhz", "bandwidth_mhz"):
-        v = cell.get(k)
-        try:
-            return int(v)
-        except Exception:
-            pass
-    return None
+    v = cell.get("dl_bw_mhz") or cell.get("bw_mhz") or cell.get("bandwidth_mhz")
+    if isinstance(v, int):
+        return v
+    try:
+        return int(v)
+    except Exception:
+        return None
 
 
 def build_ca_summary(pcc: Optional[Dict[str, Any]], scc_list: List[Dict[str, Any]]) -> Optional[str]:
@@ -645,10 +690,16 @@ def build_ca_summary(pcc: Optional[Dict[str, Any]], scc_list: List[Dict[str, Any
 
 
 # ===== Step-6: NetDev helpers (append-only) =====
+import fcntl
 import os
-import subprocess
+import socket
+import struct
 import time
 
+# 粗略示例匹配：+QNETDEVSTATUS: <iface>,<state>,<ipv4>,<rx>,<tx>
+_qnetdevstatus_pat = re.compile(r'\+QNETDEVSTATUS:\s*([^,]+),\s*([^,]+),\s*([^,]+),\s*(\d+),\s*(\d+)', re.I)
+
+
 def parse_qnetdevstatus(lines: list[str]) -> Optional[Dict[str, Any]]:
     """
     解析 AT+QNETDEVSTATUS 的典型回显（不同固件格式可能不同，此函数做尽量宽松匹配）。
@@ -657,37 +708,63 @@ def parse_qnetdevstatus(lines: list[str]) -> Optional[Dict[str, Any]]:
     """
     if not lines:
         return None
-    # 粗略示例匹配：+QNETDEVSTATUS: <iface>,<state>,<ipv4>,<rx>,<tx>
-    patt = re.compile(r'\+QNETDEVSTATUS:\s*([^,]+),\s*([^,]+),\s*([^,]+),\s*(\d+),\s*(\d+)', re.I)
     for ln in lines:
-        m = patt.search(ln)
+        m = _qnetdevstatus_pat.search(ln)
         if m:
-            try:
-                return {
-                    "iface": m.group(1).strip(),
-                    "state": m.group(2).strip(),
-                    "ipv4":  m.group(3).strip() if m.group(3).strip() not in ("", "0.0.0.0", "N/A") else None,
-                    "rx_bytes": int(m.group(4)),
-                    "tx_bytes": int(m.group(5)),
-                }
-            except Exception:
-                pass
+            # 计数两组是 \d+，int() 不会失败，不必再包 try
+            ipv4 = m.group(3).strip()
+            return {
+                "iface": m.group(1).strip(),
+                "state": m.group(2).strip(),
+                "ipv4":  ipv4 if ipv4 not in ("", "0.0.0.0", "N/A") else None,
+                "rx_bytes": int(m.group(4)),
+                "tx_bytes": int(m.group(5)),
+            }
     return None
 
 
 def _read_int(path: str) -> Optional[int]:
+    # sysfs 计数文件只有一行数字：os.read 直接取字节，不建 io 缓冲/解码层
     try:
-        with open(path, "r") as f:
-            return int(f.read().strip())
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            buf = os.read(fd, 32)
+        finally:
+            os.close(fd)
+        return int(buf)
     except Exception:
         return None
 
 
+def _proc_net_dev() -> Dict[str, Tuple[int, int]]:
+    """读一次 /proc/net/dev，得到所有网卡的 (rx_bytes, tx_bytes)"""
+    out: Dict[str, Tuple[int, int]] = {}
+    try:
+        with open("/proc/net/dev", "r") as f:
+            text = f.read()
+    except Exception:
+        return out
+    for ln in text.splitlines()[2:]:  # 前两行是表头
+        name, sep, data = ln.partition(":")
+        cols = data.split()
+        if not sep or len(cols) < 9:
+            continue
+        try:
+            out[name.strip()] = (int(cols[0]), int(cols[8]))
+        except ValueError:
+            continue
+    return out
+
+
+_SIOCGIFADDR = 0x8915
+
+
 def _ip4_of(iface: str) -> Optional[str]:
+    # ioctl(SIOCGIFADDR) 直接取主 IPv4 地址，不再 fork 一次 `ip addr`；无地址时内核返回错误
     try:
-        out = subprocess.check_output(["ip", "-4", "-o", "addr", "show", iface], timeout=0.6).decode("utf-8", "ignore")
-        m = re.search(r'\sinet\s(\d+\.\d+\.\d+\.\d+)/\d+', out)
-        return m.group(1) if m else None
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            res = fcntl.ioctl(s.fileno(), _SIOCGIFADDR, struct.pack("256s", iface[:15].encode()))
+        return socket.inet_ntoa(res[20:24])
     except Exception:
         return None
 
@@ -699,20 +776,26 @@ def probe_sys_netdev(prefer: list[str] = None) -> Optional[Dict[str, Any]]:
     """
     if prefer is None:
         prefer = ["wwan0", "usb0", "eth1", "eth0"]
-    # 选择接口
-    candidates = [i for i in prefer if os.path.exists(f"/sys/class/net/{i}")]
+    # 选择接口：目录只列一次
+    try:
+        present = os.listdir("/sys/class/net")
+    except Exception:
+        present = []
+    candidates = [i for i in prefer if i in present]
     if not candidates:
-        try:
-            for i in os.listdir("/sys/class/net"):
-                if i not in ("lo",) and os.path.exists(f"/sys/class/net/{i}/statistics"):
-                    candidates.append(i)
-        except Exception:
-            pass
+        for i in present:
+            if i not in ("lo",) and os.path.exists(f"/sys/class/net/{i}/statistics"):
+                candidates.append(i)
     if not candidates:
         return None
     iface = candidates[0]
-    rx = _read_int(f"/sys/class/net/{iface}/statistics/rx_bytes")
-    tx = _read_int(f"/sys/class/net/{iface}/statistics/tx_bytes")
+    # 计数优先取 /proc/net/dev（一次读完），读不到再回落到 sysfs
+    counters = _proc_net_dev().get(iface)
+    if counters is not None:
+        rx, tx = counters
+    else:
+        rx = _read_int(f"/sys/class/net/{iface}/statistics/rx_bytes")
+        tx = _read_int(f"/sys/class/net/{iface}/statistics/tx_bytes")
     ip4 = _ip4_of(iface)
     return {
         "iface": iface,
@@ -723,8 +806,10 @@ def probe_sys_netdev(prefer: list[str] = None) -> Optional[Dict[str, Any]]:
     }
 
 
-# 进程内速率缓存：{iface: (last_rx, last_tx, last_ts)}
-_NETDEV_RATE_CACHE: Dict[str, tuple[int, int, float]] = {}
+# 进程内速率缓存：{iface: (last_rx, last_tx, last_ns)}
+# 时间用 monotonic_ns：不受 NTP 校时跳变影响，且全程整数运算
+_NETDEV_RATE_CACHE: Dict[str, tuple[int, int, int]] = {}
+_MIN_RATE_DT_NS = 1_000_000  # 两次采样最小间隔按 1ms 计，避免除以接近 0 的数
 
 
 def with_rates(entry: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -738,29 +823,31 @@ def with_rates(entry: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     tx = entry.get("tx_bytes")
     if not iface or rx is None or tx is None:
         return entry
-    now = time.time()
+    now = time.monotonic_ns()
     last = _NETDEV_RATE_CACHE.get(iface)
     _NETDEV_RATE_CACHE[iface] = (rx, tx, now)
     if not last:
         return entry
     lrx, ltx, lts = last
-    dt = max(0.001, now - lts)
-    drx = max(0, rx - lrx) if rx >= lrx else 0
-    dtx = max(0, tx - ltx) if tx >= ltx else 0
-    entry["rx_rate_bps"] = int(drx * 8 / dt)
-    entry["tx_rate_bps"] = int(dtx * 8 / dt)
+    dt_ns = max(_MIN_RATE_DT_NS, now - lts)
+    drx = rx - lrx if rx >= lrx else 0
+    dtx = tx - ltx if tx >= ltx else 0
+    entry["rx_rate_bps"] = drx * 8_000_000_000 // dt_ns
+    entry["tx_rate_bps"] = dtx * 8_000_000_000 // dt_ns
     return entry
 
 
 # ===== Step-7: PDP/APN/DNS Session Parsers =====
 
+_cgdcont_pat = re.compile(r'\+CGDCONT:\s*(\d+)\s*,\s*"([^"]*)"\s*,\s*"([^"]*)"', re.I)
+
+
 def parse_cgdcont(lines: List[str]) -> Dict[int, Dict[str, Any]]:
     # +CGDCONT: <cid>,"<pdp_type>","<apn>",...
     out = {}
     if not lines: return out
-    patt = re.compile(r'\+CGDCONT:\s*(\d+)\s*,\s*"([^"]*)"\s*,\s*"([^"]*)"', re.I)
     for ln in lines:
-        m = patt.search(ln)
+        m = _cgdcont_pat.search(ln)
         if m:
             cid = int(m.group(1))
             out[cid] = out.get(cid, {})
@@ -769,57 +856,59 @@ def parse_cgdcont(lines: List[str]) -> Dict[int, Dict[str, Any]]:
     return out
 
 
+_cgact_pat = re.compile(r'\+CGACT:\s*(\d+)\s*,\s*(\d+)', re.I)
+
+
 def parse_cgact(lines: List[str]) -> Dict[int, int]:
-    # +CGACT: <state>,<cid> 或 +CGACT: <cid>,<state> 部分机型互换，这里双向兼容
+    # 27.007 读响应为 +CGACT: <cid>,<state>，state 只有 0/1；
+    # 部分机型互换成 <state>,<cid>，第二项大于 1 时按互换处理
     out = {}
     if not lines: return out
-    pattA = re.compile(r'\+CGACT:\s*(\d+)\s*,\s*(\d+)', re.I)
     for ln in lines:
-        m = pattA.search(ln)
+        m = _cgact_pat.search(ln)
         if m:
-            a, b = int(m.group(1)), int(m.group(2))
-            # 取 (cid, state)：猜测较大的作为 cid
-            cid, state = (b, a) if b > a else (a, b)
+            cid, state = int(m.group(1)), int(m.group(2))
+            if state > 1:
+                cid, state = state, cid
             out[cid] = state
     return out
 
 
+# 宽松匹配：抓 cid 和引号内的 IP 串（本地 ip、两个 dns）
+_cgcontrdp_cid_pat = re.compile(r'\+CGCONTRDP:\s*(\d+)\s*,')
+_cgcontrdp_ips_pat = re.compile(r'\"([0-9a-fA-F:\.]+)\"')
+
+
 def parse_cgcontrdp(lines: List[str]) -> Dict[int, Dict[str, Any]]:
     # +CGCONTRDP: <cid>,<bearer_id>,<apn>,"<local_addr>",...,"<dns1>","<dns2>"
+    # apn 以 AT+CGDCONT 为准（这里不取），每行只跑 cid 匹配 + 一次 findall
     out = {}
     if not lines: return out
-    # 宽松匹配：抓 cid、apn、本地 ip、两个 dns（若存在）
-    cid_re  = re.compile(r'\+CGCONTRDP:\s*(\d+)\s*,')
-    apn_re  = re.compile(r'\+CGCONTRDP:.*?,\s*[^,]+,\s*"?(.*?)"?',)
-    ips_re  = re.compile(r'\"([0-9a-fA-F:\.]+)\"')  # 抓双引号内的 IP 串
     for ln in lines:
-        m = cid_re.search(ln)
+        m = _cgcontrdp_cid_pat.search(ln)
         if not m: 
             continue
-        cid = int(m.group(1))
-        out[cid] = out.get(cid, {})
-        # apn
-        m2 = apn_re.search(ln)
-        if m2:
-            apn = m2.group(1).strip()
-            if apn and apn.upper() != "N/A":
-                out[cid]["apn"] = apn
+        ent = out.setdefault(int(m.group(1)), {})
         # 所有引号内看作候选 IP，通常顺序里第一是本地 IP，末尾两个是 DNS1/2
-        ips = ips_re.findall(ln)
-        if ips:
-            out[cid]["ip"] = ips[0]
-            if len(ips) >= 2: out[cid]["dns1"] = ips[-2]
-            if len(ips) >= 3: out[cid]["dns2"] = ips[-1]
+        # 一行只有几个 IP：findall 一次成表比 finditer 逐个回到 Python 快
+        ips = _cgcontrdp_ips_pat.findall(ln)
+        n = len(ips)
+        if n:
+            ent["ip"] = ips[0]
+            if n >= 2: ent["dns1"] = ips[-2]
+            if n >= 3: ent["dns2"] = ips[-1]
     return out
 
 
+_qidnscfg_pat = re.compile(r'\+QIDNSCFG:\s*"IPV?6?"\s*,\s*"([^"]*)"(?:\s*,\s*"([^"]*)")?', re.I)
+
+
 def parse_qidnscfg(lines: List[str]) -> Dict[str, str]:
     # +QIDNSCFG: "IP","<dns1>","<dns2>"
     out = {}
     if not lines: return out
-    patt = re.compile(r'\+QIDNSCFG:\s*"IPV?6?"\s*,\s*"([^"]*)"(?:\s*,\s*"([^"]*)")?', re.I)
     for ln in lines:
-        m = patt.search(ln)
+        m = _qidnscfg_pat.search(ln)
         if m:
             if m.group(1): out["dns1"] = m.group(1)
             if m.group(2): out["dns2"] = m.group(2)
@@ -843,6 +932,7 @@ _REG_MAP = {
 }
 
 
+@lru_cache(maxsize=16)
 def reg_text(stat: Optional[int]) -> Optional[str]:
     return None if stat is None else _REG_MAP.get(stat, f"stat={stat}")
 
@@ -875,35 +965,53 @@ def _split_nr_nci(nci_dec: Optional[int]) -> tuple[Optional[int], Optional[int]]
     return gnb, cid
 
 
+_cereg_stat_pat = re.compile(r'\+CEREG:\s*\d\s*,\s*(\d+)')
+_c5greg_stat_pat = re.compile(r'\+C5GREG:\s*\d\s*,\s*(\d+)')
+
+
 def parse_cereg_stat(lines: List[str]) -> Optional[int]:
     # +CEREG: 0,1[, ...]
     for ln in lines or []:
-        m = re.search(r'\+CEREG:\s*\d\s*,\s*(\d+)', ln)
+        m = _cereg_stat_pat.search(ln)
         if m: return int(m.group(1))
     return None
 
 
 def parse_c5greg_stat(lines: List[str]) -> Optional[int]:
     for ln in lines or []:
-        m = re.search(r'\+C5GREG:\s*\d\s*,\s*(\d+)', ln)
+        m = _c5greg_stat_pat.search(ln)
         if m: return int(m.group(1))
     return None
 
 
+# 标签后的 ".*?," 写成按逗号整段跳的 (?:[^,\n]*,)+?：匹配结果不变，
+# 但失败时只在逗号处回溯，不再逐字符试（LTE 行跑 SA 正则、长行跑 TAC 正则都是这种情况）
+# 试过按逗号切分后定位字段（认不出再回落正则），实测反而略慢：这两条正则各约 0.3us/行，
+# 大头在下面的数字 findall，而它要在 E12E50 这类十六进制里取数字，切分代替不了
+_core_sa_pat = re.compile(
+    r'\+QENG:.*?"NR5G-SA"(?:[^,\n]*,)+?\s*(\d+)\s*,\s*(\d+)\s*,\s*([0-9A-Fa-f]+)\s*,\s*([0-9A-Fa-f]+)'
+)
+_core_lte_tac_pat = re.compile(r'"LTE"[^,\n]*,(?:[^,\n]*,)+?\d+,\d+,([0-9A-Fa-f]+)')
+
+
 def parse_qeng_serving_core(lines: List[str]) -> Dict[str, Any]:
     """
     从 QENG 'servingcell' 行抽核心字段：rat, tac(hex?), pci, arfcn, band(通过已有函数或简单猜测)。
     返回: {"rat":..., "tac_hex":..., "pci":..., "arfcn":..., "band":...}
     不做强耦合，尽量宽松匹配，避免影响现有逻辑。
+    返回普通 dict：只在本次 /live 里读几个键（空 dict 表示没解析到），不会长期保存。
     """
     out: Dict[str, Any] = {}
     for ln in lines or []:
         if "+QENG:" not in ln: 
             continue
         s = ln.strip()
-        if '"LTE"' in s or "NR5G" in s:
+        # 两个标签各只查一次，后面的正则都按它们先筛：一行通常只会跑 SA / TAC 其中一条。
+        # 不合成一条交替正则——SA 命中时不再取 LTE TAC 的优先级，交替写法表达不了
+        has_lte = '"LTE"' in s
+        if has_lte or "NR5G" in s:
             # 提取 RAT
-            if '"LTE"' in s: out["rat"] = "LTE"
+            if has_lte: out["rat"] = "LTE"
             elif "NR5G" in s:
                 out["rat"] = "NR5G-NSA" if "NSA" in s else "NR5G-SA"
             
@@ -913,11 +1021,11 @@ def parse_qeng_serving_core(lines: List[str]) -> Dict[str, Any]:
             # 实际格式：+QENG: "servingcell","NOCONN","NR5G-SA","TDD",460,00,317D32001,800,...
             # 其中 317D32001 可能是 NCI（36位十六进制），800 可能是 TAC（十进制或十六进制）
             # 尝试匹配：在 "NR5G-SA" 之后找到 MCC, MNC，然后提取后续的十六进制或数字
-            m_sa = re.search(r'\+QENG:.*?"NR5G-SA".*?,\s*(\d+)\s*,\s*(\d+)\s*,\s*([0-9A-Fa-f]+)\s*,\s*([0-9A-Fa-f]+)', s)
+            m_sa = _core_sa_pat.search(s) if '"NR5G-SA"' in s else None
             if m_sa:
                 # 判断哪个是 TAC（通常较短，12位十六进制），哪个是 NCI（较长，36位十六进制）
-                val1 = m_sa.group(3)
-                val2 = m_sa.group(4)
+                # 两种格式里 NCI 的位置不同（格式1在前、格式2在后），长度比较就是格式判别，不能换成固定位置
+                val1, val2 = m_sa.group(3, 4)
                 # 较长的通常是 NCI，较短的通常是 TAC
                 if len(val1) >= len(val2):
                     out["nci_hex"] = val1
@@ -927,77 +1035,90 @@ def parse_qeng_serving_core(lines: List[str]) -> Dict[str, Any]:
                     out["nci_hex"] = val2
             
             # 宽松提取 TAC（可能是 hex）- LTE 或非 SA 场景
-            if "tac_hex" not in out:
+            if "tac_hex" not in out and has_lte:
                 # LTE 示例：+QENG: "LTE","FDD",460,00,E12E50,406,1300,3,5,5,1847, ...
-                m_tac = re.search(r'\"LTE\".*?,.*?,\d+,\d+,([0-9A-Fa-f]+)', s)
+                m_tac = _core_lte_tac_pat.search(s)
                 if m_tac:
                     out["tac_hex"] = m_tac.group(1)
             
-            # PCI：取紧跟在 EARFCN/NRARFCN 之后的数
-            nums = re.findall(r'-?\d+', s)
             # LTE 样例：..., earfcn(6), pci(7) / NR NSA 示例中 near ARFCN/PCI
-            # 我们不强制索引，尽量兼容已有 parse
-            # 读取 ARFCN（最大的 5~6 位数字），作为兜底
-            candidates = [n for n in nums if len(n) >= 4]
-            if candidates:
-                out["arfcn"] = candidates[-1]  # 兜底取最后一个大数
-            # 简单找PCI（0~1023），兜底从 nums 中找最合适区间
-            for n in nums:
-                try:
+            # 我们不强制索引，尽量兼容已有 parse；两个兜底都是"找到即停"：
+            #   PCI 取第一个落在 0~2048 的数（已有 PCI 就不扫）
+            #   ARFCN 取最后一个 4 位以上的数：倒着找，命中即止，不建候选表
+            # AT 回显实际都是 ASCII：按 bytes 扫更快（含 encode 也划算），
+            # 非 ASCII 行仍走 str 正则，\d 的 Unicode 数字语义不变
+            if s.isascii():
+                nums = _int_tok_b_pat.findall(s.encode())
+            else:
+                nums = _int_tok_pat.findall(s)
+            if "pci" not in out:
+                for n in nums:
                     v = int(n)
                     if 0 <= v <= 2048:
-                        out.setdefault("pci", str(v))
-                except: pass
+                        out["pci"] = str(v)
+                        break
+            for n in reversed(nums):
+                if len(n) >= 4:
+                    out["arfcn"] = n.decode() if type(n) is bytes else n
+                    break
     return out
 
 
+# 去掉残留的 N / B 字母：translate 删除表一次扫完
+# 长前缀仍用 replace：它去掉的是任意位置的每一处，换成 removeprefix 结果会变
+_DEL_N = str.maketrans("", "", "N")
+_DEL_B = str.maketrans("", "", "B")
+
+
+# 输入域很小（RAT × band 字符串），纯映射，直接缓存
+@lru_cache(maxsize=256)
 def pretty_band(rat: str | None, raw_band: str | None) -> str | None:
     if not raw_band: return None
-    if rat and "NR" in rat.upper():
+    # 上游 RAT 本来就是大写（"NR5G-SA" 等）：字面命中就不再 upper() 复制
+    if rat and ("NR" in rat or "NR" in rat.upper()):
         # 允许传入 "n41"/"41"/"NR5G BAND 41" 三种兜底
-        s = raw_band.upper().replace("NR5G BAND ", "").replace("N", "")
+        s = raw_band.upper().replace("NR5G BAND ", "").translate(_DEL_N)
         return f"NR5G BAND {s}"
     else:
-        s = raw_band.upper().replace("LTE BAND ", "").replace("B", "")
+        s = raw_band.upper().replace("LTE BAND ", "").translate(_DEL_B)
         return f"LTE BAND {s}"
 
 
 # ===== Step-9: Signal Quality Rating =====
 
-def _as_float(s: str | None) -> float | None:
-    try: return float(s)
-    except: return None
-
-
-def rate_quality_lte(rsrp: str | None, sinr: str | None) -> tuple[str, str | None]:
-    r = _as_float(rsrp); s = _as_float(sinr)
-    # 简洁阈值：先看 RSRP，再看 SINR（可调整）
-    # LTE RSRP:  >=-80 优 / >=-90 良 / >=-100 中 / 其他差
-    if r is not None:
-        if r >= -80: q="excellent"
-        elif r >= -90: q="good"
-        elif r >= -100: q="fair"
-        else: q="poor"
+# RSRP 阈值（LTE/NR 相同）：>=-80 优 / >=-90 良 / >=-100 中 / 其他差
+_RSRP_BINS = (-100.0, -90.0, -80.0)
+_RSRP_LABELS = ("poor", "fair", "good", "excellent")
+# 返回值只有这四种，预先建好不可变元组，每次直接复用
+_RATE_RESULTS = {q: (q, None) for q in _RSRP_LABELS}
+
+
+def _rate(rsrp: str | None, sinr: str | None, sinr_hi: float) -> tuple[str, str | None]:
+    # float() 直接内联：None / 非数字都归为 None
+    try: r = float(rsrp)
+    except (TypeError, ValueError): r = None
+    try: s = float(sinr)
+    except (TypeError, ValueError): s = None
+    # 简洁阈值：先看 RSRP，再看 SINR（可调整）；bisect_right 让恰好等于阈值的归到高一档
+    if r is None:
+        q = "fair"
+    elif r != r:  # NaN 与任何阈值比较都不成立，按原阶梯落到 poor
+        q = "poor"
     else:
-        q="fair"
+        q = _RSRP_LABELS[bisect_right(_RSRP_BINS, r)]
     # 轻微修正（SINR加权）
     if s is not None:
-        if s >= 20 and q in ("good","fair"): q="excellent"
+        if s >= sinr_hi and q in ("good","fair"): q="excellent"
         elif s < 0 and q in ("good","excellent"): q="fair"
-    return q, None
+    return _RATE_RESULTS[q]
 
 
+# 纯函数，入参是 1dB 步进的读数串，实际出现的组合不多：按 (rsrp, sinr) 缓存
+@lru_cache(maxsize=4096)
+def rate_quality_lte(rsrp: str | None, sinr: str | None) -> tuple[str, str | None]:
+    return _rate(rsrp, sinr, 20)
+
+
+@lru_cache(maxsize=4096)
 def rate_quality_nr(rsrp: str | None, sinr: str | None) -> tuple[str, str | None]:
-    r = _as_float(rsrp); s = _as_float(sinr)
-    # NR RSRP：>=-80 优 / >=-90 良 / >=-100 中 / 其他差
-    if r is not None:
-        if r >= -80: q="excellent"
-        elif r >= -90: q="good"
-        elif r >= -100: q="fair"
-        else: q="poor"
-    else:
-        q="fair"
-    if s is not None:
-        if s >= 15 and q in ("good","fair"): q="excellent"
-        elif s < 0 and q in ("good","excellent"): q="fair"
-    return q, None
+    return _rate(rsrp, sinr, 15)